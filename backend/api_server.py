@@ -15,7 +15,7 @@ from pathlib import Path
 import sys
 
 # 导入核心模块
-from core.menu_manager import create_menu_manager
+from core.menu_manager import get_menu_manager
 from core.task_executor import task_executor, TaskFactory, Task
 from core.macro_engine import macro_engine
 from core.game_navigator import game_navigator
@@ -23,9 +23,6 @@ from core.input_controller import input_controller
 from core.keybindings import keybindings_manager
 from core.menu_config import menu_config_manager
 
-# 创建菜单管理器实例
-menu_manager = create_menu_manager()
-
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -121,6 +118,7 @@ async def root():
 async def get_main_categories():
     """获取主分类列表"""
     try:
+        menu_manager = get_menu_manager()
         categories = menu_manager.get_main_categories()
         category_keys = menu_manager.get_main_category_keys()
         return [
@@ -135,7 +133,7 @@ async def get_main_categories():
 async def get_sub_categories(main_category: str):
     """获取子分类列表"""
     try:
-        sub_categories = menu_manager.get_sub_categories(main_category)
+        sub_categories = get_menu_manager().get_sub_categories(main_category)
         result = []
         for sub_key, sub_info in sub_categories.items():
             result.append({
@@ -163,7 +161,7 @@ async def get_sub_categories(main_category: str):
 async def get_mission_type_display(mission_type: str):
     """获取任务类型显示名称"""
     try:
-        display_name = menu_manager.get_mission_type_display_name(mission_type)
+        display_name = get_menu_manager().get_mission_type_display_name(mission_type)
         return {"mission_type": mission_type, "display_name": display_name}
     except Exception as e:
         logger.error(f"获取任务类型显示名称失败: {e}")
@@ -173,7 +171,7 @@ async def get_mission_type_display(mission_type: str):
 async def get_subcategory_missions(main_category: str, sub_category: str):
     """获取指定子分类下的任务列表"""
     try:
-        missions = menu_manager.get_subcategory_missions(main_category, sub_category)
+        missions = get_menu_manager().get_subcategory_missions(main_category, sub_category)
         return {"missions": missions}
     except Exception as e:
         logger.error(f"获取任务列表失败: {e}")
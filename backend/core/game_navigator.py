@@ -9,7 +9,7 @@ from typing import Dict, Tuple, Any, Optional
 from pathlib import Path
 from .window_manager import WindowManager
 from .input_controller import input_controller
-from .utils.coordinate_parser import CoordinateParser
+from .utils.coordinate_parser import CoordinateParser, RegionTable
 from .utils.image_recognition import ImageRecognition
 
 logger = logging.getLogger(__name__)
@@ -26,13 +26,15 @@ class GameNavigator:
         """
         self.window_manager = WindowManager()
         self.coord_parser = CoordinateParser()
-        self.image_recognition = ImageRecognition()
+        self.image_recognition = ImageRecognition(window_manager=self.window_manager)
 
         # 加载配置
         if config_path is None:
             config_path = Path(__file__).parent.parent / "config" / "coordinates.json"
 
         self.config = self._load_config(config_path)
+        # 配置中的所有点击区域在加载时一次性解析
+        self.regions = RegionTable.from_config(self.config or {})
 
         if self.config:
             logger.info("游戏导航器初始化成功")
@@ -136,7 +138,7 @@ class GameNavigator:
                 logger.error(f"标签 {tab_name} 缺少位置配置")
                 return False
 
-            center_x, center_y = self.coord_parser.get_center(position)
+            center_x, center_y = self.regions.center(f"tabs.{tab_name}")
 
             # 点击标签
             if not input_controller.click_at(center_x, center_y):
@@ -183,8 +185,7 @@ class GameNavigator:
                 logger.error(f"不支持的夜航等级: {level}")
                 return False
 
-            level_position = levels_config[level]
-            level_x, level_y = self.coord_parser.get_center(level_position)
+            level_x, level_y = self.regions.center(f"night_sailing_levels.{level}")
 
             # 点击等级
             if not input_controller.click_at(level_x, level_y):
@@ -225,11 +226,11 @@ class GameNavigator:
                 logger.error(f"动作 {action_name} 缺少位置配置")
                 return False
 
-            x, y = self.coord_parser.get_center(position)
+            x, y = self.regions.center(f"actions.{action_name}")
             success = input_controller.click_at(x, y)
 
             if success:
-                logger.debug(f"执行动作: {action_config.get('description', action_name)}")
+                logger.debug("执行动作: %s", action_config.get('description', action_name))
 
             return success
 
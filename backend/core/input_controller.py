@@ -5,7 +5,7 @@
 import time
 import pyautogui
 import logging
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Optional, Tuple, Dict, Any, List, Mapping, Sequence
 from .window_manager import WindowManager
 from .utils.image_recognition import ImageRecognition
 
@@ -22,7 +22,7 @@ class InputController:
 
         # 初始化依赖组件
         self.window_manager = WindowManager()
-        self.image_recognition = ImageRecognition()
+        self.image_recognition = ImageRecognition(window_manager=self.window_manager)
 
         logger.info("输入控制器初始化完成")
 
@@ -51,7 +51,7 @@ class InputController:
             pyautogui.click(screen_x, screen_y, button=button,
                            clicks=clicks, interval=interval)
 
-            logger.debug(f"点击坐标: ({x}, {y}) -> 屏幕: ({screen_x}, {screen_y})")
+            logger.debug("点击坐标: (%s, %s) -> 屏幕: (%s, %s)", x, y, screen_x, screen_y)
             return True
 
         except Exception as e:
@@ -102,7 +102,10 @@ class InputController:
                 # 短按
                 pyautogui.press(key)
 
-            logger.debug(f"按键: {key}" + (f" (持续{duration}秒)" if duration else ""))
+            if duration:
+                logger.debug("按键: %s (持续%s秒)", key, duration)
+            else:
+                logger.debug("按键: %s", key)
             return True
 
         except Exception as e:
@@ -113,7 +116,7 @@ class InputController:
         """按下按键（不释放）"""
         try:
             pyautogui.keyDown(key)
-            logger.debug(f"按下按键: {key}")
+            logger.debug("按下按键: %s", key)
             return True
         except Exception as e:
             logger.error(f"按下按键失败: {e}")
@@ -123,7 +126,7 @@ class InputController:
         """释放按键"""
         try:
             pyautogui.keyUp(key)
-            logger.debug(f"释放按键: {key}")
+            logger.debug("释放按键: %s", key)
             return True
         except Exception as e:
             logger.error(f"释放按键失败: {e}")
@@ -142,7 +145,7 @@ class InputController:
         """
         try:
             pyautogui.typewrite(text, interval=interval)
-            logger.debug(f"输入文本: {text}")
+            logger.debug("输入文本: %s", text)
             return True
 
         except Exception as e:
@@ -165,7 +168,7 @@ class InputController:
             screen_x, screen_y = self.window_manager.window_to_screen_coords(x, y)
             pyautogui.moveTo(screen_x, screen_y, duration=duration)
 
-            logger.debug(f"移动鼠标: ({x}, {y}) -> 屏幕: ({screen_x}, {screen_y})")
+            logger.debug("移动鼠标: (%s, %s) -> 屏幕: (%s, %s)", x, y, screen_x, screen_y)
             return True
 
         except Exception as e:
@@ -188,14 +191,14 @@ class InputController:
                 return False
 
             pyautogui.sleep(seconds)
-            logger.debug(f"延迟: {seconds}秒")
+            logger.debug("延迟: %s秒", seconds)
             return True
 
         except Exception as e:
             logger.error(f"延迟失败: {e}")
             return False
 
-    def execute_action_sequence(self, actions: List[Dict[str, Any]]) -> bool:
+    def execute_action_sequence(self, actions: Sequence[Mapping[str, Any]]) -> bool:
         """
         执行动作序列
 
@@ -256,7 +259,7 @@ class InputController:
                     logger.error(f"动作 {i+1}: 未知动作类型 {action_type}")
                     return False
 
-            logger.debug(f"成功执行 {len(actions)} 个动作")
+            logger.debug("成功执行 %s 个动作", len(actions))
             return True
 
         except Exception as e:
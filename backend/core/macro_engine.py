@@ -6,14 +6,43 @@ import json
 import time
 import uuid
 import logging
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Union, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 from pathlib import Path
-from pydantic import BaseModel, Field, validator
+from types import MappingProxyType
+from pydantic import BaseModel, Field, TypeAdapter, validator
+from .utils.json_utils import dumps_json
+from .utils.config_writer import config_writer
 
 logger = logging.getLogger(__name__)
 
+# 可选依赖：大型宏配置文件的流式解析
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# 超过该大小（字节）的宏配置文件使用流式解析，避免整体加载的内存峰值
+STREAM_PARSE_THRESHOLD = 1024 * 1024
+
+# 步骤数超过该值的宏额外构建按字段分列的步骤表，执行时顺序遍历
+SOA_MIN_STEPS = 5
+
+# 默认回退操作序列（只读，所有实例共享）
+_FALLBACK_ACTIONS = tuple(MappingProxyType(action) for action in (
+    {'type': 'key', 'key': 'space', 'press_type': 'press', 'duration': 0.5},
+    {'type': 'delay', 'delay': 0.3},
+    {'type': 'key', 'key': 'enter', 'press_type': 'press', 'duration': 0.3},
+    {'type': 'delay', 'delay': 1.0},
+    {'type': 'key', 'key': 'z', 'press_type': 'press', 'duration': 2.0},
+    {'type': 'delay', 'delay': 0.5},
+    {'type': 'key', 'key': 'x', 'press_type': 'press', 'duration': 1.0},
+    {'type': 'delay', 'delay': 0.5},
+    {'type': 'key', 'key': 'c', 'press_type': 'press', 'duration': 1.5},
+))
+
 class MacroExecutionStatus(Enum):
     """宏执行状态"""
     PENDING = "待执行"
@@ -70,6 +99,19 @@ class MacroCommand(BaseModel):
     created_at: Optional[str] = Field(None, description="创建时间")
     updated_at: Optional[str] = Field(None, description="更新时间")
 
+# 最近一次格式化的时间戳 [秒, 字符串]，同一秒内复用
+_LAST_TIMESTAMP = [0, ""]
+
+def _now_str() -> str:
+    """获取当前时间字符串（按秒缓存格式化结果）"""
+    now = int(time.time())
+    if now != _LAST_TIMESTAMP[0]:
+        _LAST_TIMESTAMP[:] = [now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))]
+    return _LAST_TIMESTAMP[1]
+
+# 宏列表序列化器，保存时一次遍历已编译的模式完成整体导出
+_MACRO_LIST_ADAPTER = TypeAdapter(List[MacroCommand])
+
 class MacroEngine:
     """统一宏引擎 - 简化直接的宏系统"""
 
@@ -86,6 +128,8 @@ class MacroEngine:
 
         self.config_path = Path(config_path)
         self.macros: Dict[str, MacroCommand] = {}
+        # 宏ID -> 按字段分列的步骤表 (types, keys, delays, xs, ys, buttons, press_types, durations, texts)
+        self._step_columns: Dict[str, Tuple[tuple, ...]] = {}
         self.execution_history: List[MacroExecutionResult] = []
 
         # 任务分类到宏的映射
@@ -96,17 +140,7 @@ class MacroEngine:
         }
 
         # 默认回退操作序列
-        self.fallback_actions = [
-            {'type': 'key', 'key': 'space', 'press_type': 'press', 'duration': 0.5},
-            {'type': 'delay', 'delay': 0.3},
-            {'type': 'key', 'key': 'enter', 'press_type': 'press', 'duration': 0.3},
-            {'type': 'delay', 'delay': 1.0},
-            {'type': 'key', 'key': 'z', 'press_type': 'press', 'duration': 2.0},
-            {'type': 'delay', 'delay': 0.5},
-            {'type': 'key', 'key': 'x', 'press_type': 'press', 'duration': 1.0},
-            {'type': 'delay', 'delay': 0.5},
-            {'type': 'key', 'key': 'c', 'press_type': 'press', 'duration': 1.5},
-        ]
+        self.fallback_actions = _FALLBACK_ACTIONS
 
         # 加载配置
         self._load_config()
@@ -116,9 +150,12 @@ class MacroEngine:
         """加载配置文件"""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                    self._parse_macros(config_data.get("macros", []))
+                if IJSON_AVAILABLE and self.config_path.stat().st_size > STREAM_PARSE_THRESHOLD:
+                    self._stream_macros()
+                else:
+                    with open(self.config_path, 'r', encoding='utf-8') as f:
+                        config_data = json.load(f)
+                        self._parse_macros(config_data.get("macros", []))
             else:
                 logger.warning(f"配置文件不存在: {self.config_path}")
                 self._create_default_config()
@@ -132,27 +169,54 @@ class MacroEngine:
     def _parse_macros(self, macros_data: List[Dict[str, Any]]) -> None:
         """解析宏配置"""
         self.macros.clear()
+        self._step_columns.clear()
 
         for macro_data in macros_data:
-            try:
-                # 转换步骤格式
-                steps_data = macro_data.get("steps", [])
-                steps = []
-                for step_data in steps_data:
-                    # 标准化步骤格式
-                    if 'type' not in step_data:
-                        continue
-
-                    step = MacroStep(**step_data)
-                    steps.append(step)
-
-                # 创建宏对象
-                macro_data["steps"] = steps
-                macro = MacroCommand(**macro_data)
-                self.macros[macro.id] = macro
-
-            except Exception as e:
-                logger.error(f"解析宏配置失败: {macro_data.get('name', 'Unknown')}, 错误: {e}")
+            self._insert_macro(macro_data)
+
+    def _stream_macros(self) -> None:
+        """流式解析宏配置，逐个构建宏对象，内存占用与单个宏成正比"""
+        self.macros.clear()
+        self._step_columns.clear()
+
+        with open(self.config_path, 'rb') as f:
+            for macro_data in ijson.items(f, 'macros.item', use_float=True):
+                self._insert_macro(macro_data)
+
+    def _insert_macro(self, macro_data: Dict[str, Any]) -> None:
+        """解析单个宏配置并加入宏表"""
+        try:
+            # 转换步骤格式
+            steps_data = macro_data.get("steps", [])
+            steps = []
+            for step_data in steps_data:
+                # 标准化步骤格式
+                if 'type' not in step_data:
+                    continue
+
+                step = MacroStep(**step_data)
+                steps.append(step)
+
+            # 创建宏对象
+            macro_data["steps"] = steps
+            macro = MacroCommand(**macro_data)
+            self.macros[macro.id] = macro
+            self._index_macro_steps(macro)
+
+        except Exception as e:
+            logger.error(f"解析宏配置失败: {macro_data.get('name', 'Unknown')}, 错误: {e}")
+
+    def _index_macro_steps(self, macro: MacroCommand) -> None:
+        """为步骤较多的宏构建按字段分列的步骤表"""
+        if len(macro.steps) < SOA_MIN_STEPS:
+            self._step_columns.pop(macro.id, None)
+            return
+
+        self._step_columns[macro.id] = tuple(zip(*(
+            (step.type, step.key, step.delay, step.x, step.y,
+             step.button, step.press_type, step.duration, step.text)
+            for step in macro.steps
+        )))
 
     def _create_default_config(self) -> None:
         """创建默认配置"""
@@ -163,12 +227,12 @@ class MacroEngine:
                 "description": "系统默认的通用宏",
                 "category": "通用",
                 "enabled": True,
-                "steps": self.fallback_actions
+                "steps": [dict(action) for action in self.fallback_actions]
             }
         ]
 
         config_data = {
-            "macros": [macro.dict() for macro in default_macros],
+            "macros": default_macros,
             "version": "2.0.0",
             "last_updated": None
         }
@@ -176,22 +240,16 @@ class MacroEngine:
         self._save_config(config_data)
 
     def _save_config(self, config_data: Optional[Dict[str, Any]] = None) -> None:
-        """保存配置文件"""
+        """保存配置文件（由后台写入器原子写盘）"""
         try:
-            # 确保目录存在
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
-
             if config_data is None:
                 config_data = {
-                    "macros": [macro.dict() for macro in self.macros.values()],
+                    "macros": _MACRO_LIST_ADAPTER.dump_python(list(self.macros.values())),
                     "version": "2.0.0",
-                    "last_updated": time.strftime("%Y-%m-%d %H:%M:%S")
+                    "last_updated": _now_str()
                 }
 
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=2)
-
-            logger.info("宏配置已保存")
+            config_writer.request_save(self.config_path, dumps_json(config_data))
 
         except Exception as e:
             logger.error(f"保存宏配置失败: {e}")
@@ -320,10 +378,17 @@ class MacroEngine:
                 if progress_callback:
                     progress_callback(repeat + 1, repeat_count, f"执行宏 {macro.name} 第{repeat + 1}次")
 
-                for i, step in enumerate(macro.steps):
-                    if not self._execute_step(step, input_controller):
-                        logger.error(f"执行宏步骤失败: {macro.name}, 步骤 {i + 1}")
-                        return False
+                columns = self._step_columns.get(macro.id)
+                if columns:
+                    for i, fields in enumerate(zip(*columns)):
+                        if not self._execute_step_fields(*fields, input_controller):
+                            logger.error(f"执行宏步骤失败: {macro.name}, 步骤 {i + 1}")
+                            return False
+                else:
+                    for i, step in enumerate(macro.steps):
+                        if not self._execute_step(step, input_controller):
+                            logger.error(f"执行宏步骤失败: {macro.name}, 步骤 {i + 1}")
+                            return False
 
             logger.info(f"宏执行完成: {macro.name}")
             return True
@@ -334,36 +399,46 @@ class MacroEngine:
 
     def _execute_step(self, step: MacroStep, input_controller) -> bool:
         """执行宏步骤"""
+        return self._execute_step_fields(
+            step.type, step.key, step.delay, step.x, step.y,
+            step.button, step.press_type, step.duration, step.text,
+            input_controller
+        )
+
+    def _execute_step_fields(self, step_type, key, delay, x, y, button,
+                             press_type, duration, text, input_controller) -> bool:
+        """按字段执行宏步骤（字段顺序与步骤表一致）"""
         try:
-            if step.type == 'key':
-                return self._execute_key_step(step, input_controller)
-            elif step.type == 'delay':
-                return input_controller.delay(step.delay or 0.1)
-            elif step.type == 'click':
-                return input_controller.click_at(step.x, step.y, step.button)
-            elif step.type == 'text':
-                return input_controller.type_text(step.text or "")
+            if step_type == 'key':
+                return self._execute_key_step(key, press_type, duration, input_controller)
+            elif step_type == 'delay':
+                return input_controller.delay(delay or 0.1)
+            elif step_type == 'click':
+                return input_controller.click_at(x, y, button)
+            elif step_type == 'text':
+                return input_controller.type_text(text or "")
             else:
-                logger.error(f"未知的步骤类型: {step.type}")
+                logger.error(f"未知的步骤类型: {step_type}")
                 return False
 
         except Exception as e:
             logger.error(f"执行步骤失败: {e}")
             return False
 
-    def _execute_key_step(self, step: MacroStep, input_controller) -> bool:
+    def _execute_key_step(self, key: Optional[str], press_type: Optional[str],
+                          duration: Optional[float], input_controller) -> bool:
         """执行按键步骤"""
         try:
-            if not step.key:
+            if not key:
                 logger.error("按键步骤缺少键位配置")
                 return False
 
-            if step.press_type == "down":
-                return input_controller.key_down(step.key)
-            elif step.press_type == "up":
-                return input_controller.key_up(step.key)
+            if press_type == "down":
+                return input_controller.key_down(key)
+            elif press_type == "up":
+                return input_controller.key_up(key)
             else:  # press
-                return input_controller.press_key(step.key, step.duration)
+                return input_controller.press_key(key, duration)
 
         except Exception as e:
             logger.error(f"执行按键步骤失败: {e}")
@@ -413,20 +488,36 @@ class MacroEngine:
         return macro.name if macro else "未知宏"
 
     def create_macro(self, name: str, description: str = "",
-                    category: str = "", steps_data: List[Dict[str, Any]] = None) -> Optional[MacroCommand]:
-        """创建新宏"""
+                    category: str = "",
+                    steps_data: Optional[List[Union[Dict[str, Any], MacroStep]]] = None,
+                    trusted: bool = False) -> Optional[MacroCommand]:
+        """
+        创建新宏
+
+        Args:
+            name: 宏名称
+            description: 宏描述
+            category: 宏分类
+            steps_data: 步骤列表，元素可以是字典或已构建的 MacroStep
+            trusted: 步骤数据来自程序内部且已校验时为 True，跳过 Pydantic 校验
+
+        Returns:
+            创建的宏，失败返回None
+        """
         try:
             macro_id = str(uuid.uuid4())
 
-            # 解析步骤
-            steps = []
-            if steps_data:
-                for i, step_data in enumerate(steps_data):
-                    steps.append(MacroStep(**step_data))
+            # 解析步骤（已是 MacroStep 的直接复用）
+            step_ctor = MacroStep.model_construct if trusted else MacroStep
+            steps = [
+                step if isinstance(step, MacroStep) else step_ctor(**step)
+                for step in (steps_data or ())
+            ]
 
             # 创建宏
-            current_time = time.strftime("%Y-%m-%d %H:%M:%S")
-            macro = MacroCommand(
+            current_time = _now_str()
+            macro_ctor = MacroCommand.model_construct if trusted else MacroCommand
+            macro = macro_ctor(
                 id=macro_id,
                 name=name,
                 description=description,
@@ -439,6 +530,7 @@ class MacroEngine:
 
             # 保存宏
             self.macros[macro_id] = macro
+            self._index_macro_steps(macro)
             self._save_config()
 
             logger.info(f"已创建宏: {name}")
@@ -457,6 +549,7 @@ class MacroEngine:
 
             macro_name = self.macros[macro_id].name
             del self.macros[macro_id]
+            self._step_columns.pop(macro_id, None)
             self._save_config()
 
             logger.info(f"已删除宏: {macro_name}")
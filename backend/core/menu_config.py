@@ -4,8 +4,12 @@
 """
 import json
 import logging
+from contextlib import contextmanager
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, List
+from .utils.json_utils import dumps_json
+from .utils.config_writer import config_writer
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +30,13 @@ class MenuConfigManager:
 
         self.config_path = Path(config_path)
         self.config_data = {}
+        self._mission_types_view = MappingProxyType({})
+        self._mt_get = self._mission_types_view.get
+
+        # 批量编辑时暂停写盘，退出批量上下文后统一保存一次
+        self._save_suspended = 0
+        self._dirty = False
+
         self._load_config()
 
     def _load_config(self) -> None:
@@ -34,6 +45,7 @@ class MenuConfigManager:
             if self.config_path.exists():
                 with open(self.config_path, 'r', encoding='utf-8') as f:
                     self.config_data = json.load(f)
+                self._refresh_mission_types_view()
                 logger.info("已加载菜单配置")
             else:
                 logger.warning(f"菜单配置文件不存在: {self.config_path}")
@@ -81,22 +93,52 @@ class MenuConfigManager:
                 }
             }
         }
+        self._refresh_mission_types_view()
         self._save_config()
 
-    def _save_config(self) -> None:
-        """保存配置文件"""
-        try:
-            # 确保目录存在
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
+    def _refresh_mission_types_view(self) -> None:
+        """重建任务类型只读快照（配置变更后调用）"""
+        self._mission_types_view = MappingProxyType(dict(self.config_data.get("missionTypes", {})))
+        self._mt_get = self._mission_types_view.get
 
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, ensure_ascii=False, indent=2)
+    def _save_config(self) -> None:
+        """保存配置文件（批量编辑期间只标记为待保存）"""
+        if self._save_suspended:
+            self._dirty = True
+            return
 
-            logger.info("菜单配置已保存")
+        try:
+            # 序列化当前快照，由后台写入器原子写盘
+            config_writer.request_save(self.config_path, dumps_json(self.config_data))
+            self._dirty = False
 
         except Exception as e:
             logger.error(f"保存菜单配置失败: {e}")
 
+    @contextmanager
+    def batch(self):
+        """
+        批量编辑上下文，期间的修改只在退出时保存一次
+
+        用法:
+            with menu_config_manager.batch():
+                menu_config_manager.add_mission(...)
+                menu_config_manager.remove_mission(...)
+        """
+        self._save_suspended += 1
+        try:
+            yield self
+        finally:
+            self._save_suspended -= 1
+            if not self._save_suspended and self._dirty:
+                self._save_config()
+
+    def flush(self) -> None:
+        """将待保存的修改写入磁盘，返回时数据已落盘"""
+        if self._dirty and not self._save_suspended:
+            self._save_config()
+        config_writer.flush()
+
     def get_menu_config(self) -> Dict[str, Any]:
         """获取完整菜单配置"""
         return self.config_data
@@ -107,8 +149,7 @@ class MenuConfigManager:
 
     def get_mission_type_display_name(self, mission_type: str) -> str:
         """获取任务类型的显示名称"""
-        mission_types = self.get_mission_types()
-        return mission_types.get(mission_type, mission_type)
+        return self._mt_get(mission_type, mission_type)
 
     def get_main_categories(self) -> List[str]:
         """获取主分类列表"""
@@ -135,6 +176,7 @@ class MenuConfigManager:
         """更新菜单配置"""
         try:
             self.config_data = config_data
+            self._refresh_mission_types_view()
             self._save_config()
             logger.info("菜单配置更新成功")
             return True
@@ -146,6 +188,7 @@ class MenuConfigManager:
         """更新任务类型映射"""
         try:
             self.config_data["missionTypes"] = mission_types
+            self._refresh_mission_types_view()
             self._save_config()
             logger.info("任务类型映射更新成功")
             return True
@@ -247,8 +290,8 @@ class MenuConfigManager:
     def export_config(self, file_path: str) -> bool:
         """导出配置到文件"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, ensure_ascii=False, indent=2)
+            with open(file_path, 'wb') as f:
+                f.write(dumps_json(self.config_data))
             logger.info(f"菜单配置已导出到: {file_path}")
             return True
         except Exception as e:
@@ -271,6 +314,7 @@ class MenuConfigManager:
                 return False
 
             self.config_data = config_data
+            self._refresh_mission_types_view()
             self._save_config()
             logger.info(f"菜单配置已从文件导入: {file_path}")
             return True
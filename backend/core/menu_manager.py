@@ -3,41 +3,79 @@
 负责加载和管理游戏任务菜单配置
 """
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+
+from .utils.json_utils import dumps_json, loads_json
+from .utils.config_writer import config_writer
+
+# 默认菜单配置文件路径
+_DEFAULT_CONFIG_FILE = Path(__file__).parent.parent / "config" / "menu_config.json"
+
+# 解析结果缓存格式版本，缓存内容结构变化时递增以废弃旧缓存
+_CACHE_VERSION = 4
 
 
-@dataclass
 class LevelInfo:
     """等级信息"""
-    key: str
-    displayName: str
+    __slots__ = ('key', 'displayName')
+
+    def __init__(self, key: str, displayName: str):
+        self.key = key
+        self.displayName = displayName
+
+    def __repr__(self) -> str:
+        return f"LevelInfo(key={self.key!r}, displayName={self.displayName!r})"
+
+
+# 无等级任务共享的空等级元组
+_EMPTY_LEVELS: Tuple[LevelInfo, ...] = ()
 
 
-@dataclass
 class MissionInfo:
     """任务信息"""
-    key: str
-    displayName: str
-    type: str
-    levels: List[LevelInfo]
+    __slots__ = ('key', 'displayName', 'type', 'levels')
+
+    def __init__(self, key: str, displayName: str, type: str, levels: Tuple[LevelInfo, ...]):
+        self.key = key
+        self.displayName = displayName
+        self.type = type
+        self.levels = levels
+
+    def __repr__(self) -> str:
+        return (f"MissionInfo(key={self.key!r}, displayName={self.displayName!r}, "
+                f"type={self.type!r}, levels={self.levels!r})")
 
 
-@dataclass
 class CategoryInfo:
     """分类信息"""
-    key: str
-    displayName: str
-    missions: Dict[str, MissionInfo]
+    __slots__ = ('key', 'displayName', 'missions')
+
+    def __init__(self, key: str, displayName: str, missions: Dict[str, MissionInfo]):
+        self.key = key
+        self.displayName = displayName
+        self.missions = missions
+
+    def __repr__(self) -> str:
+        return (f"CategoryInfo(key={self.key!r}, displayName={self.displayName!r}, "
+                f"missions={self.missions!r})")
 
 
-@dataclass
 class SubCategoryInfo:
     """子分类信息"""
-    key: str
-    displayName: str
-    children: Dict[str, MissionInfo]
+    __slots__ = ('key', 'displayName', 'children')
+
+    def __init__(self, key: str, displayName: str, children: Dict[str, MissionInfo]):
+        self.key = key
+        self.displayName = displayName
+        self.children = children
+
+    def __repr__(self) -> str:
+        return (f"SubCategoryInfo(key={self.key!r}, displayName={self.displayName!r}, "
+                f"children={self.children!r})")
 
 
 class MenuManager:
@@ -51,21 +89,51 @@ class MenuManager:
             config_file: 菜单配置文件路径，默认为config目录下的menu_config.json
         """
         if config_file is None:
-            config_file = Path(__file__).parent.parent / "config" / "menu_config.json"
+            config_file = _DEFAULT_CONFIG_FILE
 
         self.config_file = config_file
         self.mission_types = {}
         self.menu_structure = {}
+
+        # 由 menu_structure 转换得到的缓存，加载配置时统一构建
+        self._sub_categories_cache: Dict[str, Dict[str, SubCategoryInfo]] = {}
+        self._missions_by_path: Dict[Tuple[str, str, str], MissionInfo] = {}
+        self._all_missions: Tuple[MissionInfo, ...] = ()
+        self._main_category_keys: Tuple[str, ...] = ()
+
         self.load_config()
 
     def load_config(self):
-        """加载菜单配置"""
+        """加载菜单配置（配置文件未修改时直接使用上次的解析结果）"""
+        index = self._load_cache()
+        if index is not None:
+            self._build_caches(index)
+            return
+
+        config_read = self._read_config()
+        index = self._flatten_menu()
+        self._build_caches(index)
+        if config_read:
+            self._save_cache(index)
+
+    def reload(self):
+        """重新加载菜单配置并重建缓存"""
+        self.load_config()
+
+    def _read_config(self) -> bool:
+        """
+        读取菜单配置文件
+
+        Returns:
+            是否成功读取配置文件（False 表示已回退到默认配置）
+        """
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                config = loads_json(f.read())
 
             self.mission_types = config.get('missionTypes', {})
             self.menu_structure = config.get('menu', {})
+            return True
 
         except FileNotFoundError:
             # 配置文件不存在时，使用默认配置
@@ -81,6 +149,63 @@ class MenuManager:
             print("使用默认菜单配置")
             self._load_default_config()
 
+        return False
+
+    @property
+    def _cache_file(self) -> Path:
+        """解析结果缓存文件路径（与配置文件同目录）"""
+        config_path = Path(self.config_file)
+        return config_path.with_name(config_path.name + ".cache")
+
+    def _cache_key(self) -> Optional[Tuple[int, int, int]]:
+        """根据配置文件的修改时间和大小生成缓存键，文件不存在时返回None"""
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    def _load_cache(self) -> Optional[List[Any]]:
+        """
+        尝试从缓存恢复配置和展平的菜单索引（缓存只含 JSON 基本类型，数据对象加载后重建）
+
+        Returns:
+            展平的菜单索引，缓存缺失、过期或格式错误时返回None
+        """
+        key = self._cache_key()
+        if key is None:
+            return None
+
+        try:
+            with open(self._cache_file, 'rb') as f:
+                cached = loads_json(f.read())
+            if cached.get('key') != list(key):
+                return None
+            mission_types, menu_structure, index = cached['missionTypes'], cached['menu'], cached['index']
+        except Exception:
+            return None
+
+        self.mission_types = mission_types
+        self.menu_structure = menu_structure
+        return index
+
+    def _save_cache(self, index: List[Any]):
+        """保存配置和展平的菜单索引，下次启动配置未变时跳过菜单结构的逐层遍历"""
+        key = self._cache_key()
+        if key is None:
+            return
+
+        try:
+            data = dumps_json({
+                'key': list(key),
+                'missionTypes': self.mission_types,
+                'menu': self.menu_structure,
+                'index': index,
+            })
+            config_writer.request_save(self._cache_file, data)
+        except Exception as e:
+            print(f"警告: 保存菜单配置缓存失败: {e}")
+
     def _load_default_config(self):
         """加载默认菜单配置"""
         # 基于coordinates.json中的tabs配置生成默认菜单
@@ -131,15 +256,63 @@ class MenuManager:
             }
         }
 
+    def _flatten_menu(self) -> List[Any]:
+        """
+        将菜单结构展平为只含基本类型的索引，可直接写入缓存
+
+        Returns:
+            [[主分类key, 子分类key, 子分类名称, [[任务key, 任务名称, 任务类型, [[等级key, 等级名称], ...]], ...]], ...]
+        """
+        index = []
+        for main_key, main_data in self.menu_structure.items():
+            for sub_key, sub_data in main_data.get('children', {}).items():
+                missions = [
+                    [
+                        mission_data.get('key', ''),
+                        mission_data.get('displayName', ''),
+                        mission_data.get('type', ''),
+                        [[level_data.get('key', ''), level_data.get('displayName', '')]
+                         for level_data in mission_data.get('levels', [])],
+                    ]
+                    for mission_data in sub_data.get('missions', [])
+                ]
+                index.append([main_key, sub_key, sub_data.get('displayName', sub_key), missions])
+        return index
+
+    def _build_caches(self, index: List[Any]):
+        """由展平的菜单索引一次性构建数据对象并建立索引"""
+        self._sub_categories_cache = {main_key: {} for main_key in self.menu_structure}
+        self._missions_by_path = {}
+        all_missions = []
+        self._main_category_keys = tuple(self.menu_structure)
+
+        for main_key, sub_key, sub_display_name, missions in index:
+            category_info = SubCategoryInfo(sub_key, sub_display_name, {})
+
+            for mission_key, display_name, mission_type, levels_data in missions:
+                # 转换等级数据（无等级任务共享空元组）
+                levels = tuple([
+                    LevelInfo(level_key, level_name) for level_key, level_name in levels_data
+                ]) if levels_data else _EMPTY_LEVELS
+
+                mission_info = MissionInfo(mission_key, display_name, mission_type, levels)
+                category_info.children[mission_key] = mission_info
+                self._missions_by_path[(main_key, sub_key, mission_key)] = mission_info
+
+            self._sub_categories_cache[main_key][sub_key] = category_info
+            all_missions.extend(category_info.children.values())
+
+        self._all_missions = tuple(all_missions)
+
     def get_main_categories(self) -> List[str]:
         """获取主分类显示名称列表"""
         return [data.get('displayName', key) for key, data in self.menu_structure.items()]
 
-    def get_main_category_keys(self) -> List[str]:
+    def get_main_category_keys(self) -> Tuple[str, ...]:
         """获取主分类key列表"""
-        return list(self.menu_structure.keys())
+        return self._main_category_keys
 
-    def get_sub_categories(self, main_category_key: str) -> Dict[str, SubCategoryInfo]:
+    def get_sub_categories(self, main_category_key: str) -> Mapping[str, SubCategoryInfo]:
         """
         获取指定主分类下的子分类
 
@@ -147,58 +320,13 @@ class MenuManager:
             main_category_key: 主分类key
 
         Returns:
-            子分类字典
+            子分类字典（只读视图，不复制缓存）
         """
-        if main_category_key not in self.menu_structure:
-            return {}
-
-        main_data = self.menu_structure[main_category_key]
-        sub_categories = {}
-
-        for sub_key, sub_data in main_data.get('children', {}).items():
-            category_info = SubCategoryInfo(
-                key=sub_key,
-                displayName=sub_data.get('displayName', sub_key),
-                children={}
-            )
-
-            missions_data = sub_data.get('missions', [])
-            for mission_data in missions_data:
-                mission_key = mission_data.get('key', '')
-                levels_data = mission_data.get('levels', [])
-
-                # 转换等级数据
-                levels = []
-                for level_data in levels_data:
-                    level_info = LevelInfo(
-                        key=level_data.get('key', ''),
-                        displayName=level_data.get('displayName', '')
-                    )
-                    levels.append(level_info)
-
-                mission_info = MissionInfo(
-                    key=mission_key,
-                    displayName=mission_data.get('displayName', ''),
-                    type=mission_data.get('type', ''),
-                    levels=levels
-                )
-                category_info.children[mission_key] = mission_info
-
-            sub_categories[sub_key] = category_info
-
-        return sub_categories
+        return MappingProxyType(self._sub_categories_cache.get(main_category_key, {}))
 
-    def get_all_missions(self) -> List[MissionInfo]:
+    def get_all_missions(self) -> Tuple[MissionInfo, ...]:
         """获取所有任务列表"""
-        all_missions = []
-
-        for main_category_key in self.get_main_category_keys():
-            sub_categories = self.get_sub_categories(main_category_key)
-            for sub_category in sub_categories.values():
-                for mission in sub_category.children.values():
-                    all_missions.append(mission)
-
-        return all_missions
+        return self._all_missions
 
     def get_mission_by_path(self, main_category_key: str, sub_category_key: str, mission_key: str) -> Optional[MissionInfo]:
         """
@@ -212,11 +340,7 @@ class MenuManager:
         Returns:
             任务信息，如果未找到返回None
         """
-        sub_categories = self.get_sub_categories(main_category_key)
-        if sub_category_key not in sub_categories:
-            return None
-
-        return sub_categories[sub_category_key].children.get(mission_key)
+        return self._missions_by_path.get((main_category_key, sub_category_key, mission_key))
 
     def get_subcategory_missions(self, main_category_key: str, sub_category_key: str) -> List[Dict[str, Any]]:
         """
@@ -276,26 +400,40 @@ class MenuManager:
         Returns:
             JSON格式的选择配置
         """
-        return json.dumps(selections, ensure_ascii=False, indent=2)
+        return dumps_json(selections).decode('utf-8')
 
     def __str__(self) -> str:
         return f"MenuManager(main_categories={self.get_main_categories()})"
 
 
+def _build_default_manager(config_file) -> MenuManager:
+    """构建使用默认菜单配置的最小可用实例（不读取配置文件）"""
+    manager = MenuManager.__new__(MenuManager)
+    manager.config_file = config_file
+    manager._load_default_config()
+    manager._build_caches(manager._flatten_menu())
+    return manager
+
+
 # 创建默认实例，但允许失败
-def create_menu_manager() -> MenuManager:
+def create_menu_manager(config_file: Optional[str] = None) -> MenuManager:
     """创建菜单管理器实例"""
+    if config_file is None:
+        config_file = _DEFAULT_CONFIG_FILE
+
+    if not Path(config_file).exists():
+        print(f"警告: 菜单配置文件未找到: {config_file}")
+        print("使用默认菜单配置")
+        return _build_default_manager(config_file)
+
     try:
-        return MenuManager()
+        return MenuManager(config_file)
     except Exception as e:
         print(f"创建菜单管理器失败: {e}")
-        # 创建一个最小可用实例
-        manager = MenuManager.__new__(MenuManager)
-        manager.mission_types = {
-            "commission": "委托",
-            "night_sailing": "夜航手册",
-            "commission_letter": "委托密函"
-        }
-        manager.menu_structure = {}
-        manager.config_file = ""
-        return manager
\ No newline at end of file
+        return _build_default_manager(config_file)
+
+
+@lru_cache(maxsize=1)
+def get_menu_manager() -> MenuManager:
+    """获取全局菜单管理器实例（首次调用时才加载配置）"""
+    return create_menu_manager()
@@ -5,12 +5,13 @@
 """
 import time
 import logging
+import threading
 import psutil
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple, Generator
 from enum import Enum
 from dataclasses import dataclass
 from .config import config
-from .macro_engine import macro_engine, MacroExecutionResult
+from .macro_engine import macro_engine, MacroExecutionResult, MacroExecutionStatus
 from .game_navigator import game_navigator
 from .window_manager import WindowManager
 from .input_controller import input_controller
@@ -23,6 +24,20 @@ class TaskCategory(Enum):
     NIGHT_SAILING = "夜航手册"
     COMMISSION_LETTER = "委托密函"
 
+# 任务类型关键字 -> 任务分类（按长度降序匹配，避免 'commission' 抢先命中 'commission_letter'）
+_CATEGORY_MAP: Dict[str, TaskCategory] = {
+    'commission_letter': TaskCategory.COMMISSION_LETTER,
+    'night_sailing': TaskCategory.NIGHT_SAILING,
+    'commission': TaskCategory.COMMISSION,
+}
+
+# 任务分类 -> 导航器任务类型
+_CATEGORY_TO_MISSION_TYPE: Dict[TaskCategory, str] = {
+    TaskCategory.COMMISSION: 'commission',
+    TaskCategory.NIGHT_SAILING: 'night_sailing',
+    TaskCategory.COMMISSION_LETTER: 'commission_letter',
+}
+
 @dataclass
 class Task:
     """简化后的任务数据结构"""
@@ -42,10 +57,15 @@ class Task:
 class GameController:
     """游戏控制器 - 简化版游戏状态管理"""
 
-    def __init__(self):
+    def __init__(self, stop_event: Optional[threading.Event] = None):
         self.window_manager = WindowManager()
+        # 停止信号：等待期间收到停止请求时立即唤醒
+        self._stop_event = stop_event if stop_event is not None else threading.Event()
         self.in_game_timeout = 30  # 进入游戏超时时间
         self.task_completion_timeout = 120  # 任务完成超时时间
+        self.process_check_ttl = 5.0  # 游戏进程名校验间隔（秒）
+        self._game_pid: Optional[int] = None  # 已找到的游戏进程PID
+        self._last_process_check = 0.0
 
     def ensure_in_game(self) -> bool:
         """确保在游戏中"""
@@ -75,9 +95,24 @@ class GameController:
     def _check_game_process(self) -> bool:
         """检查游戏进程是否运行"""
         try:
-            for process in psutil.process_iter(['pid', 'name']):
+            # 已找到过游戏进程时只确认该PID仍然存活，超过TTL再核对进程名（防止PID被复用）
+            if self._game_pid is not None and psutil.pid_exists(self._game_pid):
+                now = time.monotonic()
+                if now - self._last_process_check < self.process_check_ttl:
+                    return True
+                try:
+                    if psutil.Process(self._game_pid).name() == config.game_process_name:
+                        self._last_process_check = now
+                        return True
+                except psutil.Error:
+                    pass
+
+            self._game_pid = None
+            for process in psutil.process_iter(['name']):
                 if process.info['name'] == config.game_process_name:
-                    logger.debug(f"找到游戏进程: PID {process.info['pid']}")
+                    self._game_pid = process.pid
+                    self._last_process_check = time.monotonic()
+                    logger.debug("找到游戏进程: PID %s", process.pid)
                     return True
             return False
         except Exception as e:
@@ -87,16 +122,10 @@ class GameController:
     def _wait_for_game_interface(self) -> bool:
         """等待游戏界面加载"""
         logger.info("等待游戏界面加载")
-        start_time = time.time()
 
-        while time.time() - start_time < self.in_game_timeout:
-            # 简化实现：假设游戏界面已加载
-            # 在实际应用中，这里应该使用图像识别检测游戏特征元素
-            time.sleep(1)
-            return True  # 简化版直接返回成功
-
-        logger.error("游戏界面加载超时")
-        return False
+        # 简化实现：假设游戏界面已加载
+        # 在实际应用中，这里应该在 in_game_timeout 内使用图像识别检测游戏特征元素
+        return True
 
     def wait_for_task_completion(self, task_name: str = "") -> bool:
         """检测任务完成"""
@@ -109,7 +138,9 @@ class GameController:
             # 简化实现：等待一段时间后认为任务完成
             # 在实际应用中，这里应该检测任务完成界面、奖励界面等
 
-            time.sleep(check_interval)
+            if self._stop_event.wait(check_interval):
+                logger.info(f"收到停止信号，停止检测任务完成: {task_name}")
+                return False
             # 模拟任务完成检测
             if time.time() - start_time > 10:  # 假设10秒后任务完成
                 logger.info(f"任务完成: {task_name}")
@@ -129,12 +160,12 @@ class GameController:
                 # 继续同一个任务
                 logger.info("准备下一次相同任务执行")
                 input_controller.press_key('enter')  # 再次挑战
-                time.sleep(3)
+                self._stop_event.wait(3)
             else:
                 # 切换到下一个任务，返回主界面
                 logger.info("准备切换到下一个任务")
                 input_controller.press_key('esc')  # 返回
-                time.sleep(2)
+                self._stop_event.wait(2)
 
             return True
 
@@ -150,7 +181,7 @@ class GameController:
             # 模拟收集奖励操作
             screen_width, _ = input_controller.window_manager.window_to_screen_coords(960, 540)
             input_controller.click_at(960, 540 + 50)  # 点击中央偏下位置
-            time.sleep(1)
+            self._stop_event.wait(1)
 
             logger.info("奖励收集完成")
             return True
@@ -165,7 +196,8 @@ class TaskExecutor:
     def __init__(self):
         self.is_running = False
         self.should_stop = False
-        self.game_controller = GameController()
+        self._stop_event = threading.Event()
+        self.game_controller = GameController(self._stop_event)
 
         logger.info("任务执行器初始化完成")
 
@@ -180,16 +212,45 @@ class TaskExecutor:
         Returns:
             是否全部成功完成
         """
+        n_tasks = len(tasks)
+        runs = self.execute_task_queue_iter(tasks)
+        while True:
+            try:
+                completed_runs, total_runs, task_index, task = next(runs)
+            except StopIteration as finished:
+                return finished.value
+
+            if progress_callback is not None:
+                status = f"任务[{task_index+1}/{n_tasks}] 第{task.current_run}/{task.run_count}次"
+                progress_callback(completed_runs, total_runs, status)
+
+    def execute_task_queue_iter(self, tasks: List[Task]) -> Generator[Tuple[int, int, int, Task], None, bool]:
+        """
+        逐次执行任务队列，每完成一次执行产出一次进度
+
+        调用方可自行决定进度的处理频率（例如界面更新限流）
+
+        Args:
+            tasks: 任务列表
+
+        Yields:
+            (已完成次数, 总次数, 当前任务下标, 当前任务)，状态描述由调用方按需格式化
+
+        Returns:
+            是否全部成功完成（生成器结束时的返回值）
+        """
         if not tasks:
             logger.warning("任务队列为空")
             return False
 
         self.is_running = True
         self.should_stop = False
+        self._stop_event.clear()
+        n_tasks = len(tasks)
         total_runs = sum(task.run_count for task in tasks)
         completed_runs = 0
 
-        logger.info(f"开始执行任务队列（8步流程），共{len(tasks)}个任务，{total_runs}次执行")
+        logger.info("开始执行任务队列（8步流程），共%s个任务，%s次执行", n_tasks, total_runs)
 
         try:
             # 步骤3：进入游戏（整个流程只需要进入一次）
@@ -203,7 +264,7 @@ class TaskExecutor:
                     logger.info("收到停止信号，中断执行")
                     break
 
-                logger.info(f"开始执行任务[{task_index+1}/{len(tasks)}]: {task.name}")
+                logger.info("开始执行任务[%s/%s]: %s", task_index+1, n_tasks, task.name)
 
                 # 执行单个任务多次
                 for run in range(task.run_count):
@@ -212,56 +273,53 @@ class TaskExecutor:
                         break
 
                     task.current_run = run + 1
-                    logger.info(f"执行任务第{task.current_run}/{task.run_count}次")
+                    logger.info("执行任务第%s/%s次", task.current_run, task.run_count)
 
                     # 步骤4：根据任务分类执行不同的跳转逻辑
                     if not self._navigate_to_task(task):
-                        logger.error(f"导航到任务失败: {task.name}")
+                        logger.error("导航到任务失败: %s", task.name)
                         continue
 
                     # 步骤5：进入游戏关卡（如果需要）
                     if not self.game_controller.ensure_in_game():
-                        logger.error(f"确保在游戏中失败: {task.name}")
+                        logger.error("确保在游戏中失败: %s", task.name)
                         continue
 
                     # 步骤6：循环执行配置的宏
                     if not self._execute_macros(task):
-                        logger.error(f"宏执行失败: {task.name}")
+                        logger.error("宏执行失败: %s", task.name)
                         continue
 
                     # 步骤6（续）：检测任务完成
                     if not self.game_controller.wait_for_task_completion(task.name):
-                        logger.warning(f"任务完成检测失败: {task.name}")
+                        logger.warning("任务完成检测失败: %s", task.name)
 
                     # 收集奖励
                     if not self.game_controller.collect_rewards():
-                        logger.warning(f"收集奖励失败: {task.name}")
+                        logger.warning("收集奖励失败: %s", task.name)
 
                     completed_runs += 1
-                    logger.info(f"任务执行完成: {task.name} (第{task.current_run}次)")
+                    logger.info("任务执行完成: %s (第%s次)", task.name, task.current_run)
 
                     # 更新进度
-                    if progress_callback:
-                        progress = completed_runs / total_runs * 100
-                        status = f"任务[{task_index+1}/{len(tasks)}] 第{task.current_run}/{task.run_count}次"
-                        progress_callback(completed_runs, total_runs, status)
+                    yield completed_runs, total_runs, task_index, task
 
                     # 步骤7：判断是否再次进入关卡还是退出关卡执行下一个任务
                     need_continue = self.game_controller.should_continue_next_run(task.current_run, task.run_count)
 
                     # 退出当前关卡，准备下一次执行
                     if not self.game_controller.exit_to_prepare_next_task(need_continue):
-                        logger.warning(f"退出关卡准备失败: {task.name}")
+                        logger.warning("退出关卡准备失败: %s", task.name)
 
                     # 任务间休息
-                    time.sleep(1)
+                    self._stop_event.wait(1)
 
                 # 任务切换休息
-                if not self.should_stop and task_index < len(tasks) - 1:
-                    logger.info(f"完成任务 {task_index+1}/{len(tasks)}，休息2秒后继续...")
-                    time.sleep(2)
+                if not self.should_stop and task_index < n_tasks - 1:
+                    logger.info("完成任务 %s/%s，休息2秒后继续...", task_index+1, n_tasks)
+                    self._stop_event.wait(2)
 
-            logger.info(f"任务队列执行完成: {completed_runs}/{total_runs}次成功")
+            logger.info("任务队列执行完成: %s/%s次成功", completed_runs, total_runs)
             return completed_runs == total_runs
 
         except Exception as e:
@@ -273,7 +331,7 @@ class TaskExecutor:
     def _navigate_to_task(self, task: Task) -> bool:
         """导航到指定任务 - 步骤4"""
         try:
-            logger.info(f"导航到任务: {task.name}")
+            logger.info("导航到任务: %s", task.name)
 
             # 构建导航参数
             mission_type = self._category_to_mission_type(task.category)
@@ -286,9 +344,9 @@ class TaskExecutor:
             })
 
             if success:
-                logger.info(f"成功导航到任务: {task.name}")
+                logger.info("成功导航到任务: %s", task.name)
             else:
-                logger.error(f"导航到任务失败: {task.name}")
+                logger.error("导航到任务失败: %s", task.name)
 
             return success
 
@@ -296,23 +354,19 @@ class TaskExecutor:
             logger.error(f"导航到任务失败: {e}")
             return False
 
-    def _category_to_mission_type(self, category: TaskCategory) -> str:
+    @staticmethod
+    def _category_to_mission_type(category: TaskCategory) -> str:
         """将任务分类转换为导航器需要的任务类型"""
-        category_mapping = {
-            TaskCategory.COMMISSION: 'commission',
-            TaskCategory.NIGHT_SAILING: 'night_sailing',
-            TaskCategory.COMMISSION_LETTER: 'commission_letter'
-        }
-        return category_mapping.get(category, 'commission')
+        return _CATEGORY_TO_MISSION_TYPE.get(category, 'commission')
 
     def _execute_macros(self, task: Task) -> bool:
         """执行宏 - 步骤6"""
-        logger.info(f"开始执行宏: {task.name}")
+        logger.info("开始执行宏: %s", task.name)
 
         try:
             # 定义宏执行进度回调
             def macro_progress_callback(current, total, status):
-                logger.info(f"宏执行进度: {current}/{total} - {status}")
+                logger.info("宏执行进度: %s/%s - %s", current, total, status)
 
             # 使用宏引擎执行宏
             result = macro_engine.execute_macro_for_task(
@@ -324,11 +378,11 @@ class TaskExecutor:
             )
 
             # 记录执行结果
-            if result.status.value == "执行成功":
-                logger.info(f"宏执行成功: {result.macro_name}")
+            if result.status is MacroExecutionStatus.SUCCESS:
+                logger.info("宏执行成功: %s", result.macro_name)
                 return True
             else:
-                logger.error(f"宏执行失败: {result.error_message}")
+                logger.error("宏执行失败: %s", result.error_message)
                 return False
 
         except Exception as e:
@@ -339,6 +393,7 @@ class TaskExecutor:
         """停止任务执行"""
         logger.info("停止任务执行")
         self.should_stop = True
+        self._stop_event.set()
         self.is_running = False
 
 class TaskFactory:
@@ -355,25 +410,10 @@ class TaskFactory:
         Returns:
             Task对象
         """
-        # 确定任务分类
-        sub_category = frontend_task.get('sub_category', '')
-        if 'commission' in sub_category:
-            category = TaskCategory.COMMISSION
-        elif 'night_sailing' in sub_category:
-            category = TaskCategory.NIGHT_SAILING
-        elif 'commission_letter' in sub_category:
-            category = TaskCategory.COMMISSION_LETTER
-        else:
-            # 根据任务类型判断
-            mission_type = frontend_task.get('mission_type', '')
-            if 'commission' in mission_type:
-                category = TaskCategory.COMMISSION
-            elif 'night_sailing' in mission_type:
-                category = TaskCategory.NIGHT_SAILING
-            elif 'commission_letter' in mission_type:
-                category = TaskCategory.COMMISSION_LETTER
-            else:
-                category = TaskCategory.COMMISSION  # 默认
+        # 确定任务分类：先看子分类，再看任务类型
+        category = (TaskFactory._match_category(frontend_task.get('sub_category', ''))
+                    or TaskFactory._match_category(frontend_task.get('mission_type', ''))
+                    or TaskCategory.COMMISSION)  # 默认
 
         return Task(
             id=frontend_task.get('id', ''),
@@ -385,5 +425,14 @@ class TaskFactory:
             params=frontend_task.get('params', {})
         )
 
+    @staticmethod
+    def _match_category(value: str) -> Optional[TaskCategory]:
+        """按关键字匹配任务分类，未匹配时返回None"""
+        if value:
+            for keyword, category in _CATEGORY_MAP.items():
+                if keyword in value:
+                    return category
+        return None
+
 # 全局任务执行器实例
 task_executor = TaskExecutor()
\ No newline at end of file
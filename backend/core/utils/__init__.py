@@ -4,6 +4,8 @@ Core utilities package
 """
 
 from .image_recognition import ImageRecognition
-from .coordinate_parser import CoordinateParser
+from .coordinate_parser import CoordinateParser, RegionTable
+from .json_utils import dumps_json, loads_json
+from .config_writer import ConfigWriter, config_writer
 
-__all__ = ['ImageRecognition', 'CoordinateParser']
\ No newline at end of file
+__all__ = ['ImageRecognition', 'CoordinateParser', 'RegionTable', 'dumps_json', 'loads_json', 'ConfigWriter', 'config_writer']
\ No newline at end of file
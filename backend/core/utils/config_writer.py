@@ -0,0 +1,89 @@
+"""
+配置写入模块
+由单个后台线程合并并原子写入配置文件，调用方无需等待磁盘 I/O
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWriter:
+    """后台配置写入器 - 同一文件只保留最新快照，合并窗口内的多次保存只写一次"""
+
+    def __init__(self, interval: float = 0.2):
+        """
+        初始化配置写入器
+
+        Args:
+            interval: 合并窗口（秒），收到写请求后等待该时间再统一写盘
+        """
+        self.interval = interval
+        self._pending: Dict[Path, bytes] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 进程退出前写入所有未落盘的配置
+        atexit.register(self.flush)
+
+    def request_save(self, path: Union[str, Path], data: bytes) -> None:
+        """
+        提交写请求（立即返回）
+
+        Args:
+            path: 目标文件路径
+            data: 文件内容快照
+        """
+        with self._lock:
+            self._pending[Path(path)] = data
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ConfigWriter", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def flush(self) -> None:
+        """立即写入所有待保存的配置，返回时数据已落盘"""
+        self._write_pending()
+
+    def _run(self) -> None:
+        """后台写入循环"""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            time.sleep(self.interval)
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        """写入当前所有待保存的快照"""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+
+            for path, data in pending.items():
+                self._write_atomic(path, data)
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """先写临时文件再原子替换，避免写入中断导致配置损坏"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            logger.info(f"配置已保存: {path.name}")
+
+        except Exception as e:
+            logger.error(f"保存配置失败 {path}: {e}")
+
+
+# 全局配置写入器实例
+config_writer = ConfigWriter()
@@ -2,11 +2,79 @@
 坐标解析工具模块
 处理各种坐标格式的解析和转换
 """
-from typing import Tuple, List, Union
+import re
+from functools import lru_cache
+from typing import Tuple, List, Union, Sequence, Dict, Any
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# 'x,y' 坐标字符串格式（与 int() 一致，允许符号和首尾空白）
+_COORD_RE = re.compile(r'\s*[+-]?\d+\s*,\s*[+-]?\d+\s*')
+
+
+@lru_cache(maxsize=1024)
+def _parse_coord(coord_str: str) -> Tuple[int, int]:
+    """解析 'x,y' 坐标字符串（热路径使用的模块级实现，不经过类属性查找）"""
+    try:
+        x, _, y = coord_str.partition(',')
+        return int(x), int(y)
+    except (ValueError, AttributeError) as e:
+        raise ValueError(f"无效的坐标格式: {coord_str}") from e
+
+
+@lru_cache(maxsize=1024)
+def _get_center(position: Tuple[str, ...]) -> Tuple[int, int]:
+    """计算坐标区域中心点（配置中的坐标是静态的，结果按输入缓存）"""
+    if len(position) == 1:
+        # 单点坐标
+        return _parse_coord(position[0])
+    elif len(position) == 2:
+        # 区域坐标 ["x1,y1", "x2,y2"]
+        x1, y1 = _parse_coord(position[0])
+        x2, y2 = _parse_coord(position[1])
+        return ((x1 + x2) // 2, (y1 + y2) // 2)
+    else:
+        raise ValueError(f"无效的坐标格式: {list(position)}")
+
+
+@lru_cache(maxsize=1024)
+def _parse_rect_coords(position: Tuple[str, ...]) -> Tuple[int, int, int, int]:
+    """解析矩形坐标区域（结果按输入缓存）"""
+    if len(position) != 2:
+        raise ValueError("矩形坐标需要两个点")
+
+    x1, y1 = _parse_coord(position[0])
+    x2, y2 = _parse_coord(position[1])
+
+    # 确保坐标顺序正确
+    left = min(x1, x2)
+    top = min(y1, y2)
+    right = max(x1, x2)
+    bottom = max(y1, y2)
+
+    return left, top, right, bottom
+
+
+@lru_cache(maxsize=256)
+def _parse_coords_batch(coords: Tuple[str, ...]) -> np.ndarray:
+    """批量解析坐标字符串元组（结果按输入缓存，返回只读数组）"""
+    if not coords:
+        result = np.empty((0, 2), dtype=np.int32)
+    else:
+        try:
+            result = np.array([coord.split(',') for coord in coords], dtype=np.int32)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"无效的坐标格式: {coords}") from e
+        if result.ndim != 2 or result.shape[1] != 2:
+            raise ValueError(f"无效的坐标格式: {coords}")
+
+    result.flags.writeable = False
+    return result
+
+
 class CoordinateParser:
     """坐标解析器 - 处理字符串坐标到数值的转换"""
 
@@ -22,11 +90,24 @@ class CoordinateParser:
             坐标元组 (x, y)
         """
         try:
-            x, y = coord_str.split(',')
-            return int(x), int(y)
-        except (ValueError, AttributeError) as e:
+            return _parse_coord(coord_str)
+        except TypeError as e:
+            # 不可哈希的输入同样视为格式错误
             raise ValueError(f"无效的坐标格式: {coord_str}") from e
 
+    @staticmethod
+    def parse_coords_batch(coords: Sequence[str]) -> np.ndarray:
+        """
+        批量解析 'x,y' 格式的坐标字符串
+
+        Args:
+            coords: 坐标字符串序列，如 ["100,200", "300,400"]
+
+        Returns:
+            形状为 (N, 2) 的 int32 只读数组，相同输入重复调用直接返回缓存结果
+        """
+        return _parse_coords_batch(tuple(coords))
+
     @staticmethod
     def get_center(position: Union[List[str], Tuple[str, str]]) -> Tuple[int, int]:
         """
@@ -43,16 +124,10 @@ class CoordinateParser:
         if not position:
             raise ValueError("坐标位置不能为空")
 
-        if len(position) == 1:
-            # 单点坐标
-            return CoordinateParser.parse_coord(position[0])
-        elif len(position) == 2:
-            # 区域坐标 ["x1,y1", "x2,y2"]
-            x1, y1 = CoordinateParser.parse_coord(position[0])
-            x2, y2 = CoordinateParser.parse_coord(position[1])
-            return ((x1 + x2) // 2, (y1 + y2) // 2)
-        else:
-            raise ValueError(f"无效的坐标格式: {position}")
+        try:
+            return _get_center(tuple(position))
+        except TypeError as e:
+            raise ValueError(f"无效的坐标格式: {position}") from e
 
     @staticmethod
     def validate_coords(position: Union[List[str], Tuple[str, str]]) -> bool:
@@ -65,11 +140,15 @@ class CoordinateParser:
         Returns:
             是否有效
         """
+        # 纯判断，不经过异常路径
         try:
-            CoordinateParser.get_center(position)
-            return True
-        except ValueError:
+            count = len(position)
+        except TypeError:
             return False
+        if count not in (1, 2):
+            return False
+        return all(isinstance(coord, str) and _COORD_RE.fullmatch(coord) is not None
+                   for coord in position)
 
     @staticmethod
     def parse_rect_coords(position: List[str]) -> Tuple[int, int, int, int]:
@@ -82,19 +161,10 @@ class CoordinateParser:
         Returns:
             矩形坐标 (left, top, right, bottom)
         """
-        if len(position) != 2:
-            raise ValueError("矩形坐标需要两个点")
-
-        x1, y1 = CoordinateParser.parse_coord(position[0])
-        x2, y2 = CoordinateParser.parse_coord(position[1])
-
-        # 确保坐标顺序正确
-        left = min(x1, x2)
-        top = min(y1, y2)
-        right = max(x1, x2)
-        bottom = max(y1, y2)
-
-        return left, top, right, bottom
+        try:
+            return _parse_rect_coords(tuple(position))
+        except TypeError as e:
+            raise ValueError(f"无效的坐标格式: {position}") from e
 
     @staticmethod
     def get_area_size(position: List[str]) -> Tuple[int, int]:
@@ -108,4 +178,68 @@ class CoordinateParser:
             区域尺寸 (width, height)
         """
         left, top, right, bottom = CoordinateParser.parse_rect_coords(position)
-        return right - left, bottom - top
\ No newline at end of file
+        return right - left, bottom - top
+
+
+class RegionTable:
+    """区域坐标表 - 配置加载时一次性解析所有区域，点击时按名称直接取中心点"""
+
+    def __init__(self, regions: Dict[str, Sequence[str]]):
+        """
+        初始化区域表
+
+        Args:
+            regions: 区域名称 -> 坐标位置（["x,y"] 或 ["x1,y1", "x2,y2"]），格式无效的区域会被跳过
+        """
+        self._index: Dict[str, int] = {}
+        rects = []
+        centers = []
+
+        for name, position in regions.items():
+            if not CoordinateParser.validate_coords(position):
+                logger.warning(f"区域坐标无效，已跳过: {name} -> {position}")
+                continue
+
+            if len(position) == 1:
+                x, y = CoordinateParser.parse_coord(position[0])
+                rects.append((x, y, x, y))
+            else:
+                rects.append(CoordinateParser.parse_rect_coords(position))
+            centers.append(CoordinateParser.get_center(position))
+            self._index[name] = len(rects) - 1
+
+        # 每行 (left, top, right, bottom) / (center_x, center_y)
+        self.rects = np.array(rects, dtype=np.int32).reshape(-1, 4)
+        self.centers = np.array(centers, dtype=np.int32).reshape(-1, 2)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RegionTable':
+        """
+        从坐标配置（coordinates.json）构建区域表
+
+        区域名称格式：tabs.<标签>、night_sailing_levels.<等级>、actions.<动作>
+        """
+        regions = {}
+        for name, tab in config.get('tabs', {}).items():
+            regions[f"tabs.{name}"] = tab.get('position', [])
+        for level, position in config.get('night_sailing_levels', {}).get('levels', {}).items():
+            regions[f"night_sailing_levels.{level}"] = position
+        for name, action in config.get('actions', {}).items():
+            regions[f"actions.{name}"] = action.get('position', [])
+        return cls(regions)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def center(self, name: str) -> Tuple[int, int]:
+        """获取区域中心点，区域不存在时抛出 KeyError"""
+        x, y = self.centers[self._index[name]].tolist()
+        return x, y
+
+    def rect(self, name: str) -> Tuple[int, int, int, int]:
+        """获取区域矩形 (left, top, right, bottom)，区域不存在时抛出 KeyError"""
+        left, top, right, bottom = self.rects[self._index[name]].tolist()
+        return left, top, right, bottom
@@ -6,58 +6,445 @@ import cv2
 import numpy as np
 import pyautogui
 import logging
-from typing import Optional, Tuple, List
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Tuple, List, Dict, Any
 from pathlib import Path
 
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 图像金字塔层数：先在缩小 2^层数 倍的画面上粗定位，再在原分辨率的小范围内精确匹配
+PYRAMID_LEVELS = 2
+# 金字塔最粗一层模板的最小边长，模板过小时减少层数
+_MIN_COARSE_TEMPLATE_SIZE = 8
+
+# wait_for_image 轮询间隔：从最小值开始按倍数退避，不超过最大值
+WAIT_MIN_INTERVAL = 0.05
+WAIT_MAX_INTERVAL = 0.5
+WAIT_BACKOFF_FACTOR = 1.5
+# 画面变化判定：与上次匹配的画面相比，灰度差超过 FRAME_DIFF_PIXEL_DELTA 的像素
+# 不少于 FRAME_DIFF_MIN_PIXELS 个时视为已变化（按像素计数，大画面中的小区域变化也能被发现）
+FRAME_DIFF_PIXEL_DELTA = 8
+FRAME_DIFF_MIN_PIXELS = 16
+# find_any 并行匹配的线程数（OpenCV 匹配期间释放 GIL）
+_MATCH_WORKERS = min(4, os.cpu_count() or 1)
+# 预加载时跳过超过该大小的 PNG（整页截图等），首次使用时再加载
+_PRELOAD_MAX_FILE_SIZE = 256 * 1024
+
+# 模板注册表（进程内所有 ImageRecognition 实例共享）：(资源目录, 文件名) ->
+#   {'tpl': 灰度模板, 'shape': (高, 宽), 'pyramid': 金字塔(第0层为原图), 'mask': 透明通道掩码（不透明模板为None）}
+_template_registry: Dict[Tuple[str, str], Dict[str, Any]] = {}
+# 已预加载过的资源目录
+_preloaded_dirs = set()
+_registry_lock = threading.Lock()
+
+# 多模板并行匹配的线程池（进程内共享，首次提交任务时才创建线程）
+_match_pool = ThreadPoolExecutor(max_workers=_MATCH_WORKERS, thread_name_prefix="ImageMatch")
+
 class ImageRecognition:
     """图像识别器 - 简单直接的图像匹配"""
 
-    def __init__(self, confidence_threshold: float = 0.8):
+    def __init__(self, confidence_threshold: float = 0.8, window_manager=None):
         """
         初始化图像识别器
 
         Args:
             confidence_threshold: 匹配置信度阈值
+            window_manager: 窗口管理器（可选），提供时默认只在游戏窗口客户区内查找
         """
         self.confidence_threshold = confidence_threshold
+        self.window_manager = window_manager
         self.assets_path = Path(__file__).parent.parent.parent / "assets" / "images"
+        self._assets_key = str(self.assets_path)
+        # mss 实例不能跨线程使用，每个线程各自持有一个并复用
+        self._local = threading.local()
+
+        # 启动时预处理模板（每个进程只执行一次），匹配时不再有磁盘读取和格式转换
+        self._preload_templates()
+
+    def _preload_templates(self):
+        """预加载资源目录下的 PNG 模板（整页截图等大图跳过，首次使用时再加载）"""
+        with _registry_lock:
+            if self._assets_key in _preloaded_dirs:
+                return
+            _preloaded_dirs.add(self._assets_key)
+
+        try:
+            count = 0
+            for image_path in self.assets_path.glob('*.png'):
+                if image_path.stat().st_size > _PRELOAD_MAX_FILE_SIZE:
+                    continue
+                if self._load_template(image_path.name) is not None:
+                    count += 1
+            logger.debug("已预加载 %s 个图像模板", count)
+        except Exception as e:
+            logger.warning(f"预加载图像模板失败: {e}")
+
+    def _load_template(self, image_name: str) -> Optional[Dict[str, Any]]:
+        """加载灰度模板并构建金字塔（首次加载后缓存在进程级注册表中）"""
+        key = (self._assets_key, image_name)
+        entry = _template_registry.get(key)
+        if entry is not None:
+            return entry
+
+        with _registry_lock:
+            # 等锁期间其他线程可能已完成加载
+            entry = _template_registry.get(key)
+            if entry is None:
+                entry = self._read_template(image_name)
+                if entry is not None:
+                    _template_registry[key] = entry
+            return entry
+
+    def _read_template(self, image_name: str) -> Optional[Dict[str, Any]]:
+        """从磁盘读取模板并完成灰度转换、掩码提取和金字塔构建"""
+        image_path = self.assets_path / image_name
+        if not image_path.exists():
+            logger.warning(f"图像文件不存在: {image_path}")
+            return None
+
+        image = cv2.imread(str(image_path), cv2.IMREAD_UNCHANGED)
+        if image is None:
+            logger.warning(f"图像文件无法读取: {image_path}")
+            return None
+
+        if image.dtype != np.uint8:
+            # 16位PNG等高位深图像统一转换为8位
+            image = cv2.convertScaleAbs(image, alpha=255.0 / np.iinfo(image.dtype).max)
+
+        mask = None
+        if image.ndim == 2:
+            template = image
+        elif image.shape[2] == 4:
+            template = cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+            alpha = image[:, :, 3]
+            # 带透明区域的图标用透明通道作为掩码，只比较不透明的像素
+            if alpha.min() < 255:
+                mask = np.ascontiguousarray(alpha)
+        elif image.shape[2] == 3:
+            template = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        else:
+            template = np.ascontiguousarray(image[:, :, 0])
+
+        return {
+            'tpl': template,
+            'shape': template.shape[:2],
+            # 掩码匹配只在原分辨率进行，不构建金字塔
+            'pyramid': self._build_pyramid(template) if mask is None else [template],
+            'mask': mask,
+        }
+
+    @staticmethod
+    def _build_pyramid(template: np.ndarray) -> List[np.ndarray]:
+        """构建模板金字塔，最粗一层边长不小于 _MIN_COARSE_TEMPLATE_SIZE"""
+        tiers = [template]
+        while (len(tiers) <= PYRAMID_LEVELS
+               and min(tiers[-1].shape[:2]) >= 2 * _MIN_COARSE_TEMPLATE_SIZE):
+            tiers.append(cv2.pyrDown(tiers[-1]))
+        return tiers
+
+    def _get_sct(self):
+        """获取当前线程的 mss 实例（首次调用时创建）"""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+        return sct
+
+    def _grab_screen(self, region: Optional[Dict[str, int]] = None) -> Tuple[np.ndarray, int, int]:
+        """
+        截取屏幕画面
+
+        Args:
+            region: 截取区域 {'left', 'top', 'width', 'height'}，默认为主显示器
+
+        Returns:
+            (灰度截图, 截图左上角屏幕X坐标, 截图左上角屏幕Y坐标)
+        """
+        if MSS_AVAILABLE:
+            sct = self._get_sct()
+            if region is None:
+                region = sct.monitors[1]
+            raw = sct.grab(region)
+            # 直接包装 mss 的 BGRA 缓冲区，不经过 PIL 转换
+            shot = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+            return cv2.cvtColor(shot, cv2.COLOR_BGRA2GRAY), region['left'], region['top']
+
+        if region is None:
+            shot = np.asarray(pyautogui.screenshot())
+            return cv2.cvtColor(shot, cv2.COLOR_RGB2GRAY), 0, 0
+
+        shot = np.asarray(pyautogui.screenshot(
+            region=(region['left'], region['top'], region['width'], region['height'])
+        ))
+        return cv2.cvtColor(shot, cv2.COLOR_RGB2GRAY), region['left'], region['top']
+
+    def _default_region(self) -> Optional[Dict[str, int]]:
+        """默认查找区域：游戏窗口客户区，无窗口管理器或未找到窗口时返回None（整个主显示器）"""
+        if self.window_manager is None:
+            return None
+
+        bounds = self.window_manager.get_window_bounds()
+        if not bounds:
+            return None
+
+        return {
+            'left': bounds['left'],
+            'top': bounds['top'],
+            'width': bounds['width'],
+            'height': bounds['height']
+        }
+
+    @staticmethod
+    def _match(gray: np.ndarray, template: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        """模板匹配，返回最高匹配度及其左上角位置"""
+        result = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return max_val, max_loc
+
+    @staticmethod
+    def _masked_scores(gray: np.ndarray, template: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """
+        带透明掩码的匹配度图（TM_CCOEFF_NORMED，只比较不透明像素）
+
+        与不带掩码的匹配使用同一种归一化相关系数，匹配度与 confidence 阈值的含义一致
+        """
+        scores = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED, mask=mask)
+        # 纯色区域归一化分母为0会产生NaN/inf，视为完全不匹配
+        np.nan_to_num(scores, copy=False, nan=-1.0, posinf=-1.0, neginf=-1.0)
+        return scores
+
+    @classmethod
+    def _masked_match(cls, gray: np.ndarray, template: np.ndarray,
+                      mask: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        """带透明掩码的模板匹配，返回最高匹配度及其左上角位置"""
+        _, max_val, _, max_loc = cv2.minMaxLoc(cls._masked_scores(gray, template, mask))
+        return max_val, max_loc
+
+    @staticmethod
+    def _locate(scores: np.ndarray, shape: Tuple[int, int], confidence: float,
+                need_mask: bool) -> Optional[Tuple[float, Tuple[int, int]]]:
+        """
+        从匹配度图中取出当前最佳位置
+
+        Args:
+            scores: 匹配度图（越大越好），need_mask 为 True 时会被原地修改
+            shape: 模板尺寸 (高, 宽)
+            confidence: 匹配阈值
+            need_mask: 是否屏蔽该位置附近的候选，供下一次查找使用；
+                       最后一次查找传 False，省去一次写入
+
+        Returns:
+            (匹配度, 左上角位置)，最佳位置低于阈值时返回None
+        """
+        _, max_val, _, (x, y) = cv2.minMaxLoc(scores)
+        if max_val < confidence:
+            return None
+
+        if need_mask:
+            # 屏蔽半个模板范围内的位置，避免同一目标被重复报告
+            height, width = shape
+            scores[max(y - height // 2, 0):y + height // 2 + 1,
+                   max(x - width // 2, 0):x + width // 2 + 1] = -1.0
+        return max_val, (x, y)
+
+    def _pyramid_match(self, gray: np.ndarray, tiers: List[np.ndarray],
+                       confidence: float) -> Tuple[float, Tuple[int, int]]:
+        """
+        金字塔匹配：在最粗一层定位候选位置，再只在原图对应的小区域内精确匹配；
+        精确匹配度低于阈值时（粗定位可能被缩小后相似的区域误导）退回原分辨率全图匹配
+
+        Args:
+            gray: 灰度截图
+            tiers: 模板金字塔
+            confidence: 匹配置信度阈值
+
+        Returns:
+            (原分辨率下的匹配度, 匹配左上角位置)
+        """
+        levels = len(tiers) - 1
+        if levels == 0:
+            return self._match(gray, tiers[0])
+
+        coarse = gray
+        for _ in range(levels):
+            coarse = cv2.pyrDown(coarse)
+        _, (coarse_x, coarse_y) = self._match(coarse, tiers[-1])
+
+        # 映射回原分辨率，并留出缩放误差的余量
+        scale = 1 << levels
+        margin = 2 * scale
+        height, width = tiers[0].shape[:2]
+        x0 = max(coarse_x * scale - margin, 0)
+        y0 = max(coarse_y * scale - margin, 0)
+        x1 = min(coarse_x * scale + width + margin, gray.shape[1])
+        y1 = min(coarse_y * scale + height + margin, gray.shape[0])
+
+        max_val, (x, y) = self._match(gray[y0:y1, x0:x1], tiers[0])
+        if max_val >= confidence:
+            return max_val, (x0 + x, y0 + y)
+        return self._match(gray, tiers[0])
 
-    def find_image(self, image_name: str, confidence: Optional[float] = None) -> Optional[Tuple[int, int]]:
+    def find_image(self, image_name: str, confidence: Optional[float] = None,
+                   region: Optional[Dict[str, int]] = None) -> Optional[Tuple[int, int]]:
         """
         在屏幕上查找指定图像
 
         Args:
             image_name: 图像文件名
             confidence: 匹配置信度（可选，使用默认阈值）
+            region: 查找区域 {'left', 'top', 'width', 'height'}（屏幕坐标），默认为游戏窗口客户区
 
         Returns:
             找到的图像中心坐标，未找到返回None
         """
         try:
             confidence = confidence or self.confidence_threshold
-            image_path = self.assets_path / image_name
-
-            if not image_path.exists():
-                logger.warning(f"图像文件不存在: {image_path}")
+            template = self._load_template(image_name)
+            if template is None:
                 return None
 
-            location = pyautogui.locateOnScreen(str(image_path), confidence=confidence)
-            if location:
-                center = pyautogui.center(location)
-                logger.debug(f"找到图像 {image_name} 在位置 {center}")
-                return (center.x, center.y)
+            if region is None:
+                region = self._default_region()
+
+            gray, left, top = self._grab_screen(region)
+            return self._find_in_frame(image_name, template, gray, left, top, confidence)
+
+        except Exception as e:
+            logger.error(f"图像识别失败 {image_name}: {e}")
+            return None
+
+    def find_all_images(self, image_name: str, confidence: Optional[float] = None,
+                        region: Optional[Dict[str, int]] = None,
+                        max_results: int = 10) -> List[Tuple[int, int]]:
+        """
+        在屏幕上查找指定图像的所有出现位置
+
+        Args:
+            image_name: 图像文件名
+            confidence: 匹配置信度（可选，使用默认阈值）
+            region: 查找区域（屏幕坐标），默认为游戏窗口客户区
+            max_results: 最多返回的数量
+
+        Returns:
+            按匹配度从高到低排列的中心坐标列表
+        """
+        try:
+            confidence = confidence or self.confidence_threshold
+            template = self._load_template(image_name)
+            if template is None or max_results <= 0:
+                return []
+
+            if region is None:
+                region = self._default_region()
+            gray, left, top = self._grab_screen(region)
+
+            if template['mask'] is not None:
+                scores = self._masked_scores(gray, template['tpl'], template['mask'])
             else:
-                logger.debug(f"未找到图像: {image_name}")
-                return None
+                scores = cv2.matchTemplate(gray, template['tpl'], cv2.TM_CCOEFF_NORMED)
+
+            height, width = template['shape']
+            centers = []
+            while len(centers) < max_results:
+                # 只有还会继续查找时才需要屏蔽已找到的位置
+                found = self._locate(scores, template['shape'], confidence,
+                                     need_mask=len(centers) + 1 < max_results)
+                if found is None:
+                    break
+                _, (x, y) = found
+                centers.append((left + x + width // 2, top + y + height // 2))
+
+            logger.debug("找到图像 %s 共 %s 处", image_name, len(centers))
+            return centers
 
         except Exception as e:
             logger.error(f"图像识别失败 {image_name}: {e}")
+            return []
+
+    def find_any(self, image_names: List[str], confidence: Optional[float] = None,
+                 region: Optional[Dict[str, int]] = None) -> Optional[Tuple[str, int, int]]:
+        """
+        在同一张截图中并行查找多个图像，返回最先确认匹配的一个
+
+        Args:
+            image_names: 图像文件名列表
+            confidence: 匹配置信度（可选，使用默认阈值）
+            region: 查找区域（屏幕坐标），默认为游戏窗口客户区
+
+        Returns:
+            (图像文件名, 中心X, 中心Y)，均未找到返回None
+        """
+        try:
+            confidence = confidence or self.confidence_threshold
+            templates = []
+            for image_name in image_names:
+                template = self._load_template(image_name)
+                if template is not None:
+                    templates.append((image_name, template))
+            if not templates:
+                return None
+
+            if region is None:
+                region = self._default_region()
+            gray, left, top = self._grab_screen(region)
+
+            futures = {
+                _match_pool.submit(self._find_in_frame, image_name, template,
+                                   gray, left, top, confidence): image_name
+                for image_name, template in templates
+            }
+            try:
+                for future in as_completed(futures):
+                    center = future.result()
+                    if center is not None:
+                        return futures[future], center[0], center[1]
+                return None
+            finally:
+                # 找到结果（或出错）后取消其余尚未开始的匹配，不占用共享线程池
+                for future in futures:
+                    if not future.done():
+                        future.cancel()
+
+        except Exception as e:
+            logger.error(f"图像识别失败 {image_names}: {e}")
             return None
 
+    def _find_in_frame(self, image_name: str, template: Dict[str, Any], gray: np.ndarray,
+                       left: int, top: int, confidence: float) -> Optional[Tuple[int, int]]:
+        """在已截取的画面中查找模板，返回屏幕坐标系下的中心点"""
+        if template['mask'] is not None:
+            max_val, (x, y) = self._masked_match(gray, template['tpl'], template['mask'])
+        else:
+            max_val, (x, y) = self._pyramid_match(gray, template['pyramid'], confidence)
+        if max_val >= confidence:
+            height, width = template['shape']
+            center = (left + x + width // 2, top + y + height // 2)
+            logger.debug("找到图像 %s 在位置 %s", image_name, center)
+            return center
+        else:
+            logger.debug("未找到图像: %s", image_name)
+            return None
+
+    @staticmethod
+    def _frame_changed(gray: np.ndarray, prev_gray: Optional[np.ndarray]) -> bool:
+        """判断画面相对上次匹配过的画面是否有变化（absdiff 计数远比模板匹配便宜）"""
+        if prev_gray is None or prev_gray.shape != gray.shape:
+            return True
+        changed = np.count_nonzero(cv2.absdiff(gray, prev_gray) > FRAME_DIFF_PIXEL_DELTA)
+        return changed >= FRAME_DIFF_MIN_PIXELS
+
     def wait_for_image(self, image_name: str, timeout: float = 10.0,
-                      confidence: Optional[float] = None) -> bool:
+                      confidence: Optional[float] = None,
+                      region: Optional[Dict[str, int]] = None) -> bool:
         """
         等待图像出现在屏幕上
 
@@ -65,17 +452,37 @@ class ImageRecognition:
             image_name: 图像文件名
             timeout: 超时时间（秒）
             confidence: 匹配置信度
+            region: 查找区域（屏幕坐标），默认为游戏窗口客户区
 
         Returns:
             是否找到图像
         """
-        import time
-        start_time = time.time()
+        confidence = confidence or self.confidence_threshold
+        template = self._load_template(image_name)
+        if template is None:
+            return False
 
-        while time.time() - start_time < timeout:
-            if self.find_image(image_name, confidence):
-                return True
-            time.sleep(0.5)
+        deadline = time.monotonic() + timeout
+        delay = WAIT_MIN_INTERVAL
+        prev_gray = None
+
+        while time.monotonic() < deadline:
+            try:
+                gray, left, top = self._grab_screen(
+                    region if region is not None else self._default_region()
+                )
+
+                # 与上次匹配过的画面相同时跳过模板匹配
+                if self._frame_changed(gray, prev_gray):
+                    prev_gray = gray
+                    if self._find_in_frame(image_name, template, gray, left, top, confidence):
+                        return True
+
+            except Exception as e:
+                logger.error(f"图像识别失败 {image_name}: {e}")
+
+            time.sleep(delay)
+            delay = min(delay * WAIT_BACKOFF_FACTOR, WAIT_MAX_INTERVAL)
 
         logger.warning(f"等待图像超时: {image_name}")
         return False
@@ -96,7 +503,7 @@ class ImageRecognition:
         position = self.find_image(image_name, confidence)
         if position:
             pyautogui.click(position[0], position[1], button=button)
-            logger.debug(f"点击图像: {image_name} 在位置 {position}")
+            logger.debug("点击图像: %s 在位置 %s", image_name, position)
             return True
         return False
 
@@ -110,11 +517,23 @@ class ImageRecognition:
         Returns:
             验证结果字典
         """
+        # 一次目录扫描得到所有已存在的文件名，避免逐个 stat（normcase 保持 Windows 下不区分大小写）
+        try:
+            with os.scandir(self.assets_path) as entries:
+                present = {os.path.normcase(entry.name) for entry in entries}
+        except OSError:
+            present = set()
+
         results = {}
         for image_name in image_names:
             image_path = self.assets_path / image_name
+            if os.path.basename(image_name) == image_name:
+                exists = os.path.normcase(image_name) in present
+            else:
+                # 带子目录的名称不在扫描范围内，单独检查
+                exists = image_path.exists()
             results[image_name] = {
-                "exists": image_path.exists(),
+                "exists": exists,
                 "path": str(image_path)
             }
 
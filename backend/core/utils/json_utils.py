@@ -0,0 +1,48 @@
+"""
+JSON 序列化工具模块
+优先使用 orjson 解析和序列化配置文件，不可用时回退到标准库 json
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    将数据序列化为带缩进的 UTF-8 JSON 字节串
+
+    Args:
+        data: 要序列化的数据
+
+    Returns:
+        UTF-8 编码的 JSON（缩进2格，非ASCII字符不转义）
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=_DUMP_OPTIONS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    解析 JSON 内容
+
+    Args:
+        data: JSON 字节串或字符串（字节串按 UTF-8 解码）
+
+    Returns:
+        解析后的数据
+
+    Raises:
+        json.JSONDecodeError: 内容格式错误（orjson 的异常同样是其子类）
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -3,6 +3,7 @@
 负责窗口检测、定位和坐标转换
 """
 import logging
+import sys
 import time
 from typing import Optional, Tuple, Dict, Any
 import pyautogui
@@ -21,6 +22,60 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# 窗口边界缓存有效期（秒），期间内的坐标转换直接复用上次查询结果
+BOUNDS_TTL = 0.1
+
+# SendInput 快速点击（仅 Windows），绕过 pyautogui 的逐次检查和内置停顿
+SENDINPUT_AVAILABLE = False
+if sys.platform == 'win32':
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class _MOUSEINPUT(ctypes.Structure):
+            _fields_ = [
+                ('dx', wintypes.LONG),
+                ('dy', wintypes.LONG),
+                ('mouseData', wintypes.DWORD),
+                ('dwFlags', wintypes.DWORD),
+                ('time', wintypes.DWORD),
+                ('dwExtraInfo', ctypes.c_size_t),
+            ]
+
+        class _INPUT(ctypes.Structure):
+            # MOUSEINPUT 是 INPUT 联合体中最大的成员，只声明它即可保证结构体大小正确
+            _fields_ = [('type', wintypes.DWORD), ('mi', _MOUSEINPUT)]
+
+        _INPUT_MOUSE = 0
+        # 按钮 -> (按下标志, 抬起标志)
+        _MOUSE_FLAGS = {
+            'left': (0x0002, 0x0004),
+            'right': (0x0008, 0x0010),
+            'middle': (0x0020, 0x0040),
+        }
+        # 预先构建每个按钮的 按下+抬起 输入序列，点击时直接提交
+        _CLICK_INPUTS = {
+            button: (_INPUT * 2)(
+                _INPUT(_INPUT_MOUSE, _MOUSEINPUT(0, 0, 0, down, 0, 0)),
+                _INPUT(_INPUT_MOUSE, _MOUSEINPUT(0, 0, 0, up, 0, 0)),
+            )
+            for button, (down, up) in _MOUSE_FLAGS.items()
+        }
+        _INPUT_SIZE = ctypes.sizeof(_INPUT)
+        _user32 = ctypes.windll.user32
+        SENDINPUT_AVAILABLE = True
+    except Exception as e:
+        logger.warning(f"SendInput 不可用，快速点击将回退到 pyautogui: {e}")
+
+
+def _send_click(x: int, y: int, button: str = 'left') -> bool:
+    """使用 SendInput 在屏幕坐标处点击一次"""
+    inputs = _CLICK_INPUTS.get(button)
+    if inputs is None:
+        return False
+    _user32.SetCursorPos(x, y)
+    return _user32.SendInput(2, inputs, _INPUT_SIZE) == 2
+
 
 class WindowManager:
     """游戏窗口管理器"""
@@ -33,7 +88,9 @@ class WindowManager:
         self.window_position = config.get_game_window_position()
 
         self._window = None
+        self._hwnd = None  # 缓存的窗口句柄
         self._window_bounds = None
+        self._bounds_ts = 0.0  # 上次更新窗口边界的时间（time.monotonic）
 
         # 初始化时查找窗口
         self._find_game_window()
@@ -65,7 +122,8 @@ class WindowManager:
                     logger.warning(f"未找到游戏窗口: {self.window_title}")
                     return False
 
-            # 获取窗口边界
+            # 缓存窗口句柄并获取窗口边界
+            self._hwnd = self._get_window_hwnd()
             self._update_window_bounds()
             return True
 
@@ -76,8 +134,12 @@ class WindowManager:
     def _update_window_bounds(self):
         """更新窗口边界信息"""
         if self._window:
-            # 获取窗口句柄
-            hwnd = self._get_window_hwnd()
+            self._bounds_ts = time.monotonic()
+
+            # 复用缓存的窗口句柄，句柄失效（窗口已关闭）时才重新查找
+            hwnd = self._hwnd
+            if WINDOWS_API_AVAILABLE and not (hwnd and win32gui.IsWindow(hwnd)):
+                hwnd = self._hwnd = self._get_window_hwnd()
 
             if hwnd and WINDOWS_API_AVAILABLE:
                 # 使用 Windows API 获取客户端区域大小
@@ -115,9 +177,9 @@ class WindowManager:
                         'window_height': bottom - top    # 整个窗口高度
                     }
 
-                    logger.info(f"窗口边界更新 - 客户端区域: {client_width}x{client_height}, "
-                               f"整个窗口: {(right-left)}x{(bottom-top)}")
-                    logger.debug(f"窗口边界详情: {self._window_bounds}")
+                    logger.info("窗口边界更新 - 客户端区域: %sx%s, 整个窗口: %sx%s",
+                                client_width, client_height, right - left, bottom - top)
+                    logger.debug("窗口边界详情: %s", self._window_bounds)
                     return
 
                 except Exception as e:
@@ -130,13 +192,21 @@ class WindowManager:
                 'width': self._window.width,
                 'height': self._window.height
             }
-            logger.debug(f"窗口边界（pygetwindow）: {self._window_bounds}")
+            logger.debug("窗口边界（pygetwindow）: %s", self._window_bounds)
 
     def _get_window_hwnd(self):
         """获取窗口句柄"""
         try:
             if WINDOWS_API_AVAILABLE and self._window:
-                # 通过窗口标题查找窗口句柄
+                # 优先用 FindWindow 按标题直接查找
+                try:
+                    hwnd = win32gui.FindWindow(None, self._window.title)
+                except Exception:
+                    hwnd = 0
+                if hwnd and win32gui.IsWindowVisible(hwnd):
+                    return hwnd
+
+                # 回退：枚举所有顶层窗口逐个比较标题
                 def enum_windows_callback(hwnd, windows):
                     if win32gui.IsWindowVisible(hwnd):
                         window_title = win32gui.GetWindowText(hwnd)
@@ -192,10 +262,40 @@ class WindowManager:
             窗口边界字典 {'left', 'top', 'width', 'height'}
         """
         if self._window:
-            self._update_window_bounds()  # 更新最新位置
+            # 缓存过期时才重新查询窗口位置
+            if self._window_bounds is None or time.monotonic() - self._bounds_ts >= BOUNDS_TTL:
+                self._update_window_bounds()
             return self._window_bounds
         return None
 
+    def refresh_bounds(self) -> Optional[Dict[str, int]]:
+        """
+        立即重新查询窗口边界（忽略缓存），用于已知窗口移动或缩放之后
+
+        Returns:
+            窗口边界字典 {'left', 'top', 'width', 'height'}
+        """
+        if self._window:
+            self._update_window_bounds()
+            return self._window_bounds
+        return None
+
+    def set_window(self, window) -> Optional[Dict[str, int]]:
+        """
+        切换到指定窗口，丢弃旧窗口的句柄和边界缓存
+
+        Args:
+            window: pygetwindow 窗口对象
+
+        Returns:
+            新窗口的边界字典 {'left', 'top', 'width', 'height'}
+        """
+        self._window = window
+        self._hwnd = None
+        self._window_bounds = None
+        self._bounds_ts = 0.0
+        return self.refresh_bounds()
+
     def window_to_screen_coords(self, window_x: int, window_y: int) -> Tuple[int, int]:
         """
         将窗口相对坐标转换为屏幕绝对坐标
@@ -219,7 +319,7 @@ class WindowManager:
             screen_x = bounds['left'] + window_x
             screen_y = bounds['top'] + window_y
 
-            logger.debug(f"窗口坐标 ({window_x}, {window_y}) -> 屏幕坐标 ({screen_x}, {screen_y})")
+            logger.debug("窗口坐标 (%s, %s) -> 屏幕坐标 (%s, %s)", window_x, window_y, screen_x, screen_y)
             return screen_x, screen_y
 
         except Exception as e:
@@ -250,7 +350,7 @@ class WindowManager:
             window_x = screen_x - bounds['left']
             window_y = screen_y - bounds['top']
 
-            logger.debug(f"屏幕坐标 ({screen_x}, {screen_y}) -> 窗口坐标 ({window_x}, {window_y})")
+            logger.debug("屏幕坐标 (%s, %s) -> 窗口坐标 (%s, %s)", screen_x, screen_y, window_x, window_y)
             return window_x, window_y
 
         except Exception as e:
@@ -259,7 +359,7 @@ class WindowManager:
 
     def click_at_window_coords(self, window_x: int, window_y: int,
                               button: str = 'left', clicks: int = 1,
-                              interval: float = 0.0) -> bool:
+                              interval: float = 0.0, fast: bool = False) -> bool:
         """
         在窗口相对坐标位置点击
 
@@ -269,6 +369,7 @@ class WindowManager:
             button: 鼠标按钮 ('left', 'right', 'middle')
             clicks: 点击次数
             interval: 点击间隔
+            fast: 使用 SendInput 直接点击（仅 Windows，跳过 pyautogui 的安全检查和停顿）
 
         Returns:
             是否成功点击
@@ -278,10 +379,18 @@ class WindowManager:
             screen_x, screen_y = self.window_to_screen_coords(window_x, window_y)
 
             # 执行点击
-            pyautogui.click(screen_x, screen_y, button=button,
-                           clicks=clicks, interval=interval)
+            if fast and SENDINPUT_AVAILABLE and button in _CLICK_INPUTS:
+                for i in range(clicks):
+                    if i and interval:
+                        time.sleep(interval)
+                    if not _send_click(screen_x, screen_y, button):
+                        logger.error("窗口点击失败: SendInput 未能提交输入")
+                        return False
+            else:
+                pyautogui.click(screen_x, screen_y, button=button,
+                               clicks=clicks, interval=interval)
 
-            logger.debug(f"窗口点击: ({window_x}, {window_y}) -> 屏幕: ({screen_x}, {screen_y})")
+            logger.debug("窗口点击: (%s, %s) -> 屏幕: (%s, %s)", window_x, window_y, screen_x, screen_y)
             return True
 
         except Exception as e:
@@ -364,7 +473,7 @@ class WindowManager:
             screen_x, screen_y = self.window_to_screen_coords(window_x, window_y)
             pyautogui.moveTo(screen_x, screen_y, duration=duration)
 
-            logger.debug(f"鼠标移动到窗口坐标: ({window_x}, {window_y})")
+            logger.debug("鼠标移动到窗口坐标: (%s, %s)", window_x, window_y)
             return True
 
         except Exception as e:
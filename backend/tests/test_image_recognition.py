@@ -0,0 +1,104 @@
+"""
+图像识别工具测试
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+_MODULE_PATH = Path(__file__).resolve().parents[1] / "core" / "utils" / "image_recognition.py"
+
+
+def _load_module():
+    """直接按文件加载模块，避免导入 backend.core 包时拉起窗口管理等依赖"""
+    spec = importlib.util.spec_from_file_location("image_recognition_under_test", _MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:  # pyautogui 等在无图形环境下导入失败
+        pytest.skip(f"无法加载图像识别模块: {e}", allow_module_level=True)
+    return module
+
+
+image_recognition = _load_module()
+ImageRecognition = image_recognition.ImageRecognition
+
+
+def _textured_scene(seed: int, shape=(240, 320)) -> np.ndarray:
+    """生成带纹理的灰度画面（随机噪声经模糊后更接近真实界面）"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, shape, dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (5, 5), 0)
+
+
+def _elliptical_mask(shape) -> np.ndarray:
+    mask = np.zeros(shape, dtype=np.uint8)
+    h, w = shape
+    cv2.ellipse(mask, (w // 2, h // 2), (w // 2 - 1, h // 2 - 1), 0, 0, 360, 255, -1)
+    return mask
+
+
+class TestMaskedMatch:
+    """带透明掩码的模板匹配"""
+
+    def test_finds_template_in_scene(self):
+        scene = _textured_scene(1)
+        template = scene[100:140, 150:200].copy()
+        mask = _elliptical_mask(template.shape)
+
+        score, loc = ImageRecognition._masked_match(scene, template, mask)
+
+        assert score == pytest.approx(1.0, abs=1e-3)
+        assert loc == (150, 100)
+
+    def test_unrelated_texture_scores_below_threshold(self):
+        scene = _textured_scene(2)
+        template = _textured_scene(3)[100:140, 150:200].copy()
+        mask = _elliptical_mask(template.shape)
+
+        score, _ = ImageRecognition._masked_match(scene, template, mask)
+
+        assert score < 0.5
+
+    def test_flat_scene_is_not_a_match(self):
+        scene = np.full((240, 320), 128, dtype=np.uint8)
+        template = _textured_scene(4)[100:140, 150:200].copy()
+        mask = _elliptical_mask(template.shape)
+
+        score, _ = ImageRecognition._masked_match(scene, template, mask)
+
+        assert score < 0.5
+
+
+class TestFrameChanged:
+    """wait_for_image 的画面变化判定"""
+
+    def test_first_frame_counts_as_changed(self):
+        frame = _textured_scene(5)
+        assert ImageRecognition._frame_changed(frame, None)
+
+    def test_identical_frame_is_unchanged(self):
+        frame = _textured_scene(6)
+        assert not ImageRecognition._frame_changed(frame.copy(), frame)
+
+    def test_resized_frame_counts_as_changed(self):
+        frame = _textured_scene(7)
+        assert ImageRecognition._frame_changed(frame[:100, :100].copy(), frame)
+
+    def test_small_region_change_in_large_frame(self):
+        prev = _textured_scene(8, shape=(1080, 1920))
+        frame = prev.copy()
+        # 1920x1080 画面中出现一个 24x24 的按钮
+        frame[500:524, 900:924] = 255 - frame[500:524, 900:924]
+
+        assert ImageRecognition._frame_changed(frame, prev)
+
+    def test_sensor_noise_is_ignored(self):
+        prev = _textured_scene(9, shape=(1080, 1920))
+        noise = np.random.default_rng(10).integers(-2, 3, prev.shape)
+        frame = np.clip(prev.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+        assert not ImageRecognition._frame_changed(frame, prev)
@@ -5,9 +5,11 @@
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+import queue
 import threading
 import time
 import json
+from collections import deque
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from pathlib import Path
@@ -27,6 +29,31 @@ from backend.core.config import config
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 直接调用 GetCursorPos 读取鼠标位置（仅 Windows），其他平台回退到 pyautogui
+CURSOR_API_AVAILABLE = False
+if sys.platform == 'win32':
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        # 使用独立的 user32 句柄，设置 argtypes 不影响 pyautogui 对同一函数的调用
+        _GetCursorPos = ctypes.WinDLL('user32').GetCursorPos
+        _GetCursorPos.argtypes = [ctypes.POINTER(wintypes.POINT)]
+        _GetCursorPos.restype = wintypes.BOOL
+        CURSOR_API_AVAILABLE = True
+    except (ImportError, AttributeError, OSError):
+        CURSOR_API_AVAILABLE = False
+
+# 坐标刷新间隔（毫秒），由 Tk 事件循环调度，所有界面更新都在主线程执行
+UPDATE_INTERVAL_MS = 50
+# 连续多次刷新无变化后降低刷新频率，任何变化立即恢复
+IDLE_INTERVAL_MS = 200
+IDLE_TICKS_THRESHOLD = 20
+# 保存坐标文件时的写缓冲区大小（字节）
+SAVE_BUFFER_SIZE = 1 << 16
+# 未找到游戏窗口时重新枚举系统窗口的最小间隔（秒）
+WINDOW_ENUM_INTERVAL = 1.0
+
 
 class CoordinateLocator:
     """坐标定位器主类"""
@@ -35,15 +62,34 @@ class CoordinateLocator:
         """初始化坐标定位器"""
         self.window_manager = WindowManager()
         self.running = False
-        self.update_thread = None
+        self._after_id = None
+        self._idle_ticks = 0
         self.captured_coords = []
-
-        # 创建主界面
+        # 待写入历史记录框的条目，每次刷新统一插入
+        self._pending_history = deque()
+
+        # 复用同一个 POINT 结构体读取鼠标位置，避免每次刷新分配
+        if CURSOR_API_AVAILABLE:
+            self._cursor_pt = wintypes.POINT()
+            self._cursor_ref = ctypes.byref(self._cursor_pt)
+
+        # 上次显示的内容，未变化时跳过控件更新
+        self._last_window_state = None
+        self._last_screen = None
+        self._last_window_coord = None
+        self._last_status = None
+        # 各控件当前的前景色
+        self._label_colors = {}
+
+        # 后台窗口枚举：工作线程把结果放入队列，由主线程的刷新回调取出
+        self._enum_queue = queue.Queue()
+        self._enum_running = False
+        self._last_enum_ts = 0.0
+        self._enum_reported = False
+
+        # 创建主界面（末尾启动坐标更新）
         self.setup_ui()
 
-        # 启动坐标更新
-        self.start_coordinate_update()
-
     def setup_ui(self):
         """设置用户界面"""
         self.root = tk.Tk()
@@ -76,6 +122,10 @@ class CoordinateLocator:
         # 坐标历史记录
         self.setup_coordinate_history(main_frame)
 
+        # 启动坐标更新
+        self.running = True
+        self._after_id = self.root.after(UPDATE_INTERVAL_MS, self._tick)
+
     def setup_window_status(self, parent):
         """设置窗口状态显示区域"""
         status_frame = ttk.LabelFrame(parent, text="窗口状态", padding="5")
@@ -83,23 +133,27 @@ class CoordinateLocator:
 
         # 窗口标题显示
         ttk.Label(status_frame, text="游戏窗口:").grid(row=0, column=0, sticky=tk.W)
-        self.window_title_label = ttk.Label(status_frame, text="未找到", foreground="red")
+        self.window_title_var = tk.StringVar(value="未找到")
+        self.window_title_label = ttk.Label(status_frame, textvariable=self.window_title_var, foreground="red")
         self.window_title_label.grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
 
         # 窗口大小显示
         ttk.Label(status_frame, text="窗口大小:").grid(row=0, column=2, sticky=tk.W, padx=(20, 0))
-        self.window_size_label = ttk.Label(status_frame, text="0x0")
+        self.window_size_var = tk.StringVar(value="0x0")
+        self.window_size_label = ttk.Label(status_frame, textvariable=self.window_size_var)
         self.window_size_label.grid(row=0, column=3, sticky=tk.W, padx=(5, 0))
 
         # 窗口位置显示
         ttk.Label(status_frame, text="窗口位置:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
-        self.window_position_label = ttk.Label(status_frame, text="(0, 0)")
+        self.window_position_var = tk.StringVar(value="(0, 0)")
+        self.window_position_label = ttk.Label(status_frame, textvariable=self.window_position_var)
         self.window_position_label.grid(row=1, column=1, sticky=tk.W, padx=(5, 0), pady=(5, 0))
 
         # 状态指示器
         self.status_indicator = ttk.Label(status_frame, text="●", foreground="red")
         self.status_indicator.grid(row=1, column=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
-        self.status_text = ttk.Label(status_frame, text="未连接")
+        self.status_var = tk.StringVar(value="未连接")
+        self.status_text = ttk.Label(status_frame, textvariable=self.status_var)
         self.status_text.grid(row=1, column=3, sticky=tk.W, padx=(5, 0), pady=(5, 0))
 
         # 刷新按钮
@@ -118,7 +172,9 @@ class CoordinateLocator:
         screen_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
 
         ttk.Label(screen_frame, text="屏幕坐标:", font=("Arial", 10, "bold")).grid(row=0, column=0, sticky=tk.W)
-        self.screen_coord_label = ttk.Label(screen_frame, text="(0, 0)", font=("Courier", 12))
+        # 频繁刷新的坐标通过 StringVar 更新，避免每次 config 解析选项
+        self.screen_coord_var = tk.StringVar(value="(0, 0)")
+        self.screen_coord_label = ttk.Label(screen_frame, textvariable=self.screen_coord_var, font=("Courier", 12))
         self.screen_coord_label.grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
 
         # 窗口相对坐标
@@ -126,11 +182,13 @@ class CoordinateLocator:
         window_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
 
         ttk.Label(window_frame, text="窗口坐标:", font=("Arial", 10, "bold")).grid(row=0, column=0, sticky=tk.W)
-        self.window_coord_label = ttk.Label(window_frame, text="(0, 0)", font=("Courier", 12), foreground="blue")
+        self.window_coord_var = tk.StringVar(value="(0, 0)")
+        self.window_coord_label = ttk.Label(window_frame, textvariable=self.window_coord_var, font=("Courier", 12), foreground="blue")
         self.window_coord_label.grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
 
         # 坐标状态指示
-        self.coord_status_label = ttk.Label(coord_frame, text="鼠标不在窗口内", foreground="gray")
+        self.coord_status_var = tk.StringVar(value="鼠标不在窗口内")
+        self.coord_status_label = ttk.Label(coord_frame, textvariable=self.coord_status_var, foreground="gray")
         self.coord_status_label.grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
 
     def setup_control_buttons(self, parent):
@@ -146,6 +204,10 @@ class CoordinateLocator:
         )
         self.capture_button.grid(row=0, column=0, padx=(0, 10))
 
+        # 捕获成功时的按钮闪烁样式（ttk 按钮不支持 background 选项，通过样式切换）
+        ttk.Style(self.root).configure("Captured.TButton", background="lightgreen")
+        self._flash_restore = lambda: self.capture_button.configure(style="TButton")
+
         # 清空历史按钮
         ttk.Button(button_frame, text="清空历史", command=self.clear_history).grid(row=0, column=1, padx=(0, 10))
 
@@ -155,6 +217,10 @@ class CoordinateLocator:
         # 加载按钮
         ttk.Button(button_frame, text="加载坐标", command=self.load_coordinates).grid(row=0, column=3, padx=(0, 10))
 
+        # 保存格式（默认紧凑格式，勾选后缩进便于阅读）
+        self.pretty_save_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="格式化保存", variable=self.pretty_save_var).grid(row=0, column=4)
+
         # 快捷键绑定
         self.root.bind('<space>', lambda e: self.capture_coordinate())
         self.root.bind('<Escape>', lambda e: self.quit())
@@ -182,103 +248,197 @@ class CoordinateLocator:
         self.add_history_entry("")
 
     def add_history_entry(self, text: str):
-        """添加历史记录条目"""
+        """添加历史记录条目（下次刷新时统一写入文本框）"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        entry = f"[{timestamp}] {text}\n"
-        self.history_text.insert(tk.END, entry)
+        self._pending_history.append(f"[{timestamp}] {text}\n")
+
+    def _flush_history(self):
+        """将待写入的历史记录一次性插入文本框"""
+        if not self._pending_history:
+            return
+        entries = []
+        while self._pending_history:
+            entries.append(self._pending_history.popleft())
+        self.history_text.insert(tk.END, ''.join(entries))
         self.history_text.see(tk.END)
 
-    def update_window_status(self):
-        """更新窗口状态显示"""
+    def update_window_status(self, bounds: Optional[Dict[str, int]]) -> bool:
+        """
+        更新窗口状态显示
+
+        Args:
+            bounds: 本轮刷新获取的窗口边界
+
+        Returns:
+            显示内容是否发生变化
+        """
         if self.window_manager.is_window_found():
-            bounds = self.window_manager.get_window_bounds()
-            if bounds:
-                self.window_title_label.config(
-                    text=self.window_manager._window.title,
-                    foreground="green"
-                )
-                self.window_size_label.config(text=f"{bounds['width']}x{bounds['height']}")
-                self.window_position_label.config(text=f"({bounds['left']}, {bounds['top']})")
-                self.status_indicator.config(foreground="green")
-                self.status_text.config(text="已连接")
+            return self._render_found(bounds)
+
+        self._last_window_state = None
+
+        # 取出后台枚举结果，没有结果时按间隔启动下一次枚举
+        try:
+            all_windows, error = self._enum_queue.get_nowait()
+        except queue.Empty:
+            if not self._enum_running and time.monotonic() - self._last_enum_ts > WINDOW_ENUM_INTERVAL:
+                self._start_window_enum()
+            return False
+        self._enum_running = False
+
+        # 尝试列出所有可见窗口进行调试
+        try:
+            if error is not None:
+                raise error
+
+            matching_windows = [w for w in all_windows if self.window_manager.window_title.lower() in w.title.lower()]
+
+            if matching_windows:
+                # 找到相似的窗口，使用第一个
+                bounds = self.window_manager.set_window(matching_windows[0])
+                self.add_history_entry(f"找到相似窗口: {matching_windows[0].title}")
+                return self._render_found(bounds)
             else:
-                self.window_title_label.config(text="窗口信息获取失败", foreground="orange")
-                self.status_indicator.config(foreground="orange")
-                self.status_text.config(text="错误")
+                # 显示所有窗口标题供调试（只记录一次）
+                window_titles = [w.title for w in all_windows[:10] if w.title.strip()]
+                self.window_title_var.set(f"未找到匹配窗口 (可见: {len(window_titles)}个)")
+                self._set_foreground(self.window_title_label, "red")
+                if window_titles and not self._enum_reported:
+                    self._enum_reported = True
+                    self.add_history_entry(f"可见窗口: {', '.join(window_titles[:3])}...")
+            self.window_size_var.set("0x0")
+            self.window_position_var.set("(0, 0)")
+            self._set_foreground(self.status_indicator, "red")
+            self.status_var.set("未连接")
+        except Exception as e:
+            self.window_title_var.set(f"窗口检测错误: {str(e)}")
+            self._set_foreground(self.window_title_label, "red")
+            self.window_size_var.set("0x0")
+            self.window_position_var.set("(0, 0)")
+            self._set_foreground(self.status_indicator, "red")
+            self.status_var.set("检测错误")
+        return True
+
+    def _render_found(self, bounds: Optional[Dict[str, int]]) -> bool:
+        """
+        显示已找到窗口的状态
+
+        Args:
+            bounds: 窗口边界
+
+        Returns:
+            显示内容是否发生变化
+        """
+        state = (self.window_manager._window.title, bounds)
+        if state == self._last_window_state:
+            return False
+        self._last_window_state = state
+
+        if bounds:
+            self.window_title_var.set(self.window_manager._window.title)
+            self._set_foreground(self.window_title_label, "green")
+            self.window_size_var.set(f"{bounds['width']}x{bounds['height']}")
+            self.window_position_var.set(f"({bounds['left']}, {bounds['top']})")
+            self._set_foreground(self.status_indicator, "green")
+            self.status_var.set("已连接")
         else:
-            # 尝试列出所有可见窗口进行调试
-            try:
-                import pygetwindow as gw
-                all_windows = gw.getAllWindows()
-                matching_windows = [w for w in all_windows if self.window_manager.window_title.lower() in w.title.lower()]
-
-                if matching_windows:
-                    # 找到相似的窗口，使用第一个
-                    self.window_manager._window = matching_windows[0]
-                    self.window_manager._update_window_bounds()
-                    self.add_history_entry(f"找到相似窗口: {matching_windows[0].title}")
-                    return self.update_window_status()  # 递归调用更新状态
-                else:
-                    # 显示所有窗口标题供调试
-                    window_titles = [w.title for w in all_windows[:10] if w.title.strip()]
-                    self.window_title_label.config(text=f"未找到匹配窗口 (可见: {len(window_titles)}个)", foreground="red")
-                    if window_titles:
-                        self.add_history_entry(f"可见窗口: {', '.join(window_titles[:3])}...")
-                self.window_size_label.config(text="0x0")
-                self.window_position_label.config(text="(0, 0)")
-                self.status_indicator.config(foreground="red")
-                self.status_text.config(text="未连接")
-            except Exception as e:
-                self.window_title_label.config(text=f"窗口检测错误: {str(e)}", foreground="red")
-                self.window_size_label.config(text="0x0")
-                self.window_position_label.config(text="(0, 0)")
-                self.status_indicator.config(foreground="red")
-                self.status_text.config(text="检测错误")
-
-    def update_coordinate_display(self):
-        """更新坐标显示"""
+            self.window_title_var.set("窗口信息获取失败")
+            self._set_foreground(self.window_title_label, "orange")
+            self._set_foreground(self.status_indicator, "orange")
+            self.status_var.set("错误")
+        return True
+
+    def _set_foreground(self, label, color: str):
+        """仅在颜色变化时更新控件前景色"""
+        if self._label_colors.get(label) != color:
+            self._label_colors[label] = color
+            label['foreground'] = color
+
+    def _start_window_enum(self):
+        """在后台线程中枚举系统窗口，避免阻塞界面"""
+        self._enum_running = True
+        self._last_enum_ts = time.monotonic()
+        threading.Thread(target=self._enumerate_windows, daemon=True).start()
+
+    def _enumerate_windows(self):
+        """枚举所有窗口（工作线程），结果以 (窗口列表, 异常) 放入队列"""
         try:
-            import pyautogui
+            import pygetwindow as gw
+            self._enum_queue.put((gw.getAllWindows(), None))
+        except Exception as e:
+            self._enum_queue.put(([], e))
 
-            # 获取屏幕坐标
-            screen_x, screen_y = pyautogui.position()
-            self.screen_coord_label.config(text=f"({screen_x}, {screen_y})")
+    def _get_cursor_pos(self):
+        """获取鼠标屏幕坐标"""
+        if CURSOR_API_AVAILABLE and _GetCursorPos(self._cursor_ref):
+            return self._cursor_pt.x, self._cursor_pt.y
+
+        import pyautogui
+        return pyautogui.position()
+
+    def update_coordinate_display(self, bounds: Optional[Dict[str, int]]) -> bool:
+        """
+        更新坐标显示
 
-            # 检查鼠标是否在游戏窗口内
-            if self.window_manager.is_window_found():
-                window_x, window_y = self.window_manager.screen_to_window_coords(screen_x, screen_y)
+        Args:
+            bounds: 本轮刷新获取的窗口边界
 
-                if self.window_manager.is_point_in_window(window_x, window_y):
+        Returns:
+            显示内容是否发生变化
+        """
+        try:
+            changed = False
+
+            # 获取屏幕坐标
+            screen_x, screen_y = self._get_cursor_pos()
+            if (screen_x, screen_y) != self._last_screen:
+                self._last_screen = (screen_x, screen_y)
+                self.screen_coord_var.set(f"({screen_x}, {screen_y})")
+                self._set_foreground(self.screen_coord_label, "")
+                changed = True
+
+            # 检查鼠标是否在游戏窗口内（直接使用本轮的窗口边界计算）
+            if bounds:
+                window_x = screen_x - bounds['left']
+                window_y = screen_y - bounds['top']
+
+                if 0 <= window_x <= bounds['width'] and 0 <= window_y <= bounds['height']:
                     # 鼠标在窗口内
-                    self.window_coord_label.config(
-                        text=f"({window_x}, {window_y})",
-                        foreground="blue"
-                    )
-                    self.coord_status_label.config(
-                        text="鼠标在窗口内",
-                        foreground="green"
-                    )
+                    window_coord = (f"({window_x}, {window_y})", "blue")
+                    status = ("鼠标在窗口内", "green")
                     self.current_valid_coords = (window_x, window_y)
                 else:
                     # 鼠标不在窗口内
-                    self.window_coord_label.config(
-                        text=f"({window_x}, {window_y})",
-                        foreground="gray"
-                    )
-                    self.coord_status_label.config(
-                        text="鼠标不在窗口内",
-                        foreground="gray"
-                    )
+                    window_coord = (f"({window_x}, {window_y})", "gray")
+                    status = ("鼠标不在窗口内", "gray")
                     self.current_valid_coords = None
             else:
-                self.window_coord_label.config(text="(--, --)", foreground="red")
-                self.coord_status_label.config(text="游戏窗口未找到", foreground="red")
+                window_coord = ("(--, --)", "red")
+                status = ("游戏窗口未找到", "red")
                 self.current_valid_coords = None
 
+            if window_coord != self._last_window_coord:
+                self._last_window_coord = window_coord
+                self.window_coord_var.set(window_coord[0])
+                self._set_foreground(self.window_coord_label, window_coord[1])
+                changed = True
+
+            if status != self._last_status:
+                self._last_status = status
+                self.coord_status_var.set(status[0])
+                self._set_foreground(self.coord_status_label, status[1])
+                changed = True
+
+            return changed
+
         except Exception as e:
             logger.error(f"更新坐标显示失败: {e}")
-            self.screen_coord_label.config(text="错误", foreground="red")
-            self.window_coord_label.config(text="错误", foreground="red")
+            self._last_screen = self._last_window_coord = None
+            self.screen_coord_var.set("错误")
+            self.window_coord_var.set("错误")
+            self._set_foreground(self.screen_coord_label, "red")
+            self._set_foreground(self.window_coord_label, "red")
+            return True
 
     def capture_coordinate(self):
         """捕获当前坐标"""
@@ -298,9 +458,8 @@ class CoordinateLocator:
             self.add_history_entry(f"捕获坐标: 窗口({window_x}, {window_y})")
 
             # 视觉反馈
-            original_color = self.capture_button.cget("background")
-            self.capture_button.config(background="lightgreen")
-            self.root.after(100, lambda: self.capture_button.config(background=original_color))
+            self.capture_button.configure(style="Captured.TButton")
+            self.root.after(100, self._flash_restore)
         else:
             self.add_history_entry("捕获失败: 鼠标不在游戏窗口内")
             messagebox.showwarning("捕获失败", "请将鼠标移动到游戏窗口内再捕获坐标")
@@ -308,6 +467,7 @@ class CoordinateLocator:
     def clear_history(self):
         """清空历史记录"""
         self.captured_coords.clear()
+        self._pending_history.clear()
         self.history_text.delete(1.0, tk.END)
         self.add_history_entry("=== 历史记录已清空 ===")
         self.add_history_entry("")
@@ -335,8 +495,12 @@ class CoordinateLocator:
                 'coordinates': self.captured_coords
             }
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
+            # json.dump 分段输出，大缓冲区合并为少量写入
+            with open(filepath, 'w', encoding='utf-8', buffering=SAVE_BUFFER_SIZE) as f:
+                if self.pretty_save_var.get():
+                    json.dump(save_data, f, indent=2, ensure_ascii=False)
+                else:
+                    json.dump(save_data, f, ensure_ascii=False, separators=(',', ':'))
 
             self.add_history_entry(f"坐标已保存到: {filename}")
             messagebox.showinfo("保存成功", f"坐标已保存到:\n{filepath}")
@@ -387,14 +551,49 @@ class CoordinateLocator:
             messagebox.showerror("加载失败", f"加载坐标时出错:\n{str(e)}")
 
     def select_window(self):
-        """手动选择游戏窗口"""
-        try:
-            import pygetwindow as gw
+        """手动选择游戏窗口（窗口枚举在后台线程执行，期间显示加载提示）"""
+        loading = tk.Toplevel(self.root)
+        loading.title("选择游戏窗口")
+        loading.transient(self.root)
+        ttk.Label(loading, text="正在获取窗口列表...", padding="10").pack()
+        progress = ttk.Progressbar(loading, mode='indeterminate', length=200)
+        progress.pack(padx=10, pady=(0, 10))
+        progress.start(10)
+
+        result = queue.Queue(maxsize=1)
+
+        def enumerate_windows():
+            try:
+                import pygetwindow as gw
+
+                # 获取所有可见窗口
+                visible = [w for w in gw.getAllWindows() if w.title.strip() and w.visible]
+                result.put((visible, None))
+            except Exception as e:
+                result.put(([], e))
+
+        def poll_result():
+            if not self.running:
+                return
+            try:
+                visible_windows, error = result.get_nowait()
+            except queue.Empty:
+                self.root.after(UPDATE_INTERVAL_MS, poll_result)
+                return
+
+            loading.destroy()
+            if error is not None:
+                messagebox.showerror("错误", f"选择窗口时出错:\n{str(error)}")
+                logger.error(f"选择窗口失败: {error}")
+                return
+            self._show_selector(visible_windows)
 
-            # 获取所有可见窗口
-            all_windows = gw.getAllWindows()
-            visible_windows = [w for w in all_windows if w.title.strip() and w.visible]
+        threading.Thread(target=enumerate_windows, daemon=True).start()
+        self.root.after(UPDATE_INTERVAL_MS, poll_result)
 
+    def _show_selector(self, visible_windows: List[Any]):
+        """显示窗口选择对话框"""
+        try:
             if not visible_windows:
                 messagebox.showwarning("无窗口", "没有找到可见窗口")
                 return
@@ -438,8 +637,8 @@ class CoordinateLocator:
                 selection = listbox.curselection()
                 if selection:
                     selected_window = visible_windows[selection[0]]
-                    self.window_manager._window = selected_window
-                    self.window_manager._update_window_bounds()
+                    self.window_manager.set_window(selected_window)
+                    self._last_window_state = None
                     self.add_history_entry(f"手动选择窗口: {selected_window.title}")
                     dialog.destroy()
 
@@ -463,39 +662,48 @@ class CoordinateLocator:
 
     def refresh_window(self):
         """刷新游戏窗口"""
+        # 下次刷新时强制重绘窗口状态
+        self._last_window_state = None
         if self.window_manager.refresh_window():
             self.add_history_entry("游戏窗口已刷新")
         else:
             self.add_history_entry("刷新游戏窗口失败")
 
-    def coordinate_update_loop(self):
-        """坐标更新循环"""
-        while self.running:
-            try:
-                # 更新窗口状态
-                self.update_window_status()
+    def _tick(self):
+        """坐标更新（在 Tk 主线程中由 after 周期调度）"""
+        if not self.running:
+            return
 
-                # 更新坐标显示
-                self.update_coordinate_display()
+        changed = True
+        try:
+            # 每轮只查询一次窗口边界
+            bounds = self.window_manager.get_window_bounds()
 
-                # 短暂延迟
-                time.sleep(0.05)  # 20 FPS
+            # 更新窗口状态
+            changed = self.update_window_status(bounds)
 
-            except Exception as e:
-                logger.error(f"坐标更新循环错误: {e}")
-                time.sleep(0.5)
+            # 更新坐标显示
+            changed = self.update_coordinate_display(bounds) or changed
 
-    def start_coordinate_update(self):
-        """启动坐标更新线程"""
-        self.running = True
-        self.update_thread = threading.Thread(target=self.coordinate_update_loop, daemon=True)
-        self.update_thread.start()
+            # 写入本轮新增的历史记录
+            self._flush_history()
+
+        except Exception as e:
+            logger.error(f"坐标更新错误: {e}")
+
+        # 长时间无变化时降低刷新频率
+        self._idle_ticks = 0 if changed else self._idle_ticks + 1
+        interval = IDLE_INTERVAL_MS if self._idle_ticks >= IDLE_TICKS_THRESHOLD else UPDATE_INTERVAL_MS
+        self._after_id = self.root.after(interval, self._tick)
 
     def quit(self):
         """退出程序"""
+        if not self.running:
+            return
         self.running = False
-        if self.update_thread and self.update_thread.is_alive():
-            self.update_thread.join(timeout=1.0)
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
         self.root.quit()
         self.root.destroy()
 
@@ -8,6 +8,7 @@ import os
 import sys
 import subprocess
 import shutil
+import stat
 import platform
 from pathlib import Path
 
@@ -42,6 +43,26 @@ class Colors:
         print(f"{Colors.BOLD}{msg}{Colors.END}")
 
 
+def _rm_readonly(func, path, exc):
+    """删除失败时清除只读属性后重试（Windows 下只读文件无法直接删除），同时用作 onexc/onerror 回调"""
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def remove_tree(path):
+    """删除目录树，Windows 下优先使用 rmdir 批量删除，失败时回退到 shutil.rmtree"""
+    if platform.system() == "Windows":
+        subprocess.run(["cmd", "/c", "rmdir", "/S", "/Q", str(path)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if not path.exists():
+            return
+    # Python 3.12 起 onerror 已弃用，改用 onexc
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_rm_readonly)
+    else:
+        shutil.rmtree(path, onerror=_rm_readonly)
+
+
 class ProjectBuilder:
     """项目打包器"""
 
@@ -50,14 +71,25 @@ class ProjectBuilder:
         self.backend_path = self.script_dir.parent / "backend"
         self.frontend_path = self.script_dir.parent / "frontend"
         self.dist_path = self.script_dir.parent / "dist"
+        self._command_paths = {}
+
+    def resolve_command(self, command):
+        """解析命令的可执行文件路径（找到后缓存，Windows 下可解析 .cmd 包装脚本）"""
+        path = self._command_paths.get(command)
+        if path is None:
+            path = shutil.which(command)
+            if path is not None:
+                self._command_paths[command] = path
+        return path
 
     def run_command(self, cmd, cwd=None, check=True):
-        """执行系统命令"""
+        """执行系统命令（cmd 为参数列表，不经过 shell）"""
+        argv = [self.resolve_command(cmd[0]) or cmd[0], *cmd[1:]]
         try:
-            subprocess.run(cmd, shell=True, cwd=cwd, check=check)
+            subprocess.run(argv, cwd=cwd, check=check)
             return True
-        except subprocess.CalledProcessError as e:
-            Colors.error(f"命令执行失败: {cmd}")
+        except (subprocess.CalledProcessError, OSError) as e:
+            Colors.error(f"命令执行失败: {' '.join(cmd)}")
             Colors.error(f"错误信息: {e}")
             return False
 
@@ -95,40 +127,28 @@ class ProjectBuilder:
         Colors.success("后端 API 服务器文件检查通过")
         return True
 
-    def build_frontend(self):
-        """构建前端项目"""
-        Colors.step("3. 构建前端项目...")
-
-        Colors.info("正在构建前端...")
-        if not self.run_command("pnpm run build", cwd=self.frontend_path):
-            Colors.error("前端构建失败")
-            return False
-
-        Colors.success("前端构建完成")
-        return True
-
-    def package_electron_app(self):
-        """打包 Electron 应用"""
-        Colors.step("4. 打包 Electron 应用...")
+    def build_and_package(self):
+        """构建前端并打包 Electron 应用（一次 pnpm run build:all 依次完成两步）"""
+        Colors.step("3. 构建前端并打包 Electron 应用...")
 
-        Colors.info("正在打包桌面应用...")
-        if not self.run_command("pnpm run electron:build", cwd=self.frontend_path):
-            Colors.error("Electron 打包失败")
+        Colors.info("正在构建前端并打包桌面应用...")
+        if not self.run_command(["pnpm", "run", "build:all"], cwd=self.frontend_path):
+            Colors.error("前端构建或 Electron 打包失败")
             return False
 
-        Colors.success("Electron 应用打包完成")
+        Colors.success("前端构建及 Electron 应用打包完成")
         return True
 
     def cleanup_temp_files(self):
         """清理临时文件"""
-        Colors.step("5. 清理临时文件...")
+        Colors.step("4. 清理临时文件...")
 
         # 清理前端构建缓存
         frontend_dist = self.frontend_path / "dist"
         if frontend_dist.exists():
             Colors.info("清理前端构建缓存...")
             try:
-                shutil.rmtree(frontend_dist)
+                remove_tree(frontend_dist)
                 Colors.success("前端构建缓存清理完成")
             except Exception as e:
                 Colors.warning(f"清理前端构建缓存失败: {e}")
@@ -173,12 +193,8 @@ class ProjectBuilder:
         if not self.check_backend_api():
             return 1
 
-        # 构建前端
-        if not self.build_frontend():
-            return 1
-
-        # 打包 Electron 应用
-        if not self.package_electron_app():
+        # 构建前端并打包 Electron 应用
+        if not self.build_and_package():
             return 1
 
         # 清理临时文件
@@ -4,10 +4,14 @@ EM-Automate 依赖安装脚本
 跨平台 Python 实现，自动安装前后端所有依赖
 """
 
+import io
 import os
 import sys
 import subprocess
+import shutil
 import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -41,32 +45,106 @@ class Colors:
         print(f"{Colors.BOLD}{msg}{Colors.END}")
 
 
+# 已解析的命令路径缓存
+_command_paths = {}
+
+# 命令版本号缓存
+_version_cache = {}
+
+# 并行安装时整块打印各任务输出用的锁
+_output_lock = threading.Lock()
+
+
+class _JobOutput(threading.local):
+    """当前线程所属并行任务的输出缓冲区（不在并行任务中时为 None）"""
+    buffer = None
+
+
+_job_output = _JobOutput()
+
+
+class _JobStdout:
+    """stdout 代理：并行任务线程写入各自的缓冲区，其他线程照常输出"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buffer = _job_output.buffer
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run_buffered_job(func, *args):
+    """在并行任务中执行 func，缓存其全部输出（步骤标题、命令输出、结果），结束后整块打印"""
+    _job_output.buffer = io.StringIO()
+    try:
+        return func(*args)
+    finally:
+        output = _job_output.buffer.getvalue()
+        _job_output.buffer = None
+        with _output_lock:
+            sys.stdout.write(output)
+            sys.stdout.flush()
+
+
+def resolve_command(command):
+    """解析命令的可执行文件路径（找到后缓存，Windows 下可解析 .cmd 包装脚本）"""
+    path = _command_paths.get(command)
+    if path is None:
+        path = shutil.which(command)
+        if path is not None:
+            _command_paths[command] = path
+    return path
+
+
 def run_command(cmd, cwd=None, check=True, capture_output=False):
-    """执行系统命令"""
+    """执行系统命令（cmd 为参数列表，不经过 shell）"""
+    argv = [resolve_command(cmd[0]) or cmd[0], *cmd[1:]]
     try:
         result = subprocess.run(
-            cmd,
-            shell=True,
+            argv,
             cwd=cwd,
             check=check,
             capture_output=capture_output,
             text=True
         )
         return result
-    except subprocess.CalledProcessError as e:
-        Colors.error(f"命令执行失败: {' '.join(cmd) if isinstance(cmd, list) else cmd}")
+    except (subprocess.CalledProcessError, OSError) as e:
+        Colors.error(f"命令执行失败: {' '.join(cmd)}")
         Colors.error(f"错误信息: {e}")
         return None
 
 
+def run_command_buffered(cmd, cwd=None):
+    """执行系统命令并捕获输出后再打印（子进程直接写终端会绕过并行任务的输出缓冲）"""
+    result = run_command(cmd, cwd=cwd, check=False, capture_output=True)
+    if result is None:
+        return None
+
+    output = (result.stdout or '') + (result.stderr or '')
+    if output.strip():
+        print(output.rstrip())
+    if result.returncode != 0:
+        Colors.error(f"命令执行失败: {' '.join(cmd)}")
+        Colors.error(f"退出码: {result.returncode}")
+        return None
+    return result
+
+
 def check_command_exists(command):
-    """检查命令是否存在"""
-    try:
-        subprocess.run([command, '--version'],
-                      capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    """检查命令是否存在（只在 PATH 中查找，不启动进程）"""
+    return resolve_command(command) is not None
+
+
+def get_command_version(command):
+    """获取命令版本号（每个命令只执行一次 --version）"""
+    if command not in _version_cache:
+        result = run_command([command, '--version'], capture_output=True)
+        _version_cache[command] = result.stdout.strip() if result else None
+    return _version_cache[command]
 
 
 def install_package_manager():
@@ -75,13 +153,12 @@ def install_package_manager():
 
     if not check_command_exists('pnpm'):
         Colors.info("pnpm 未找到，正在安装...")
-        if not run_command("npm install -g pnpm"):
+        if not run_command(["npm", "install", "-g", "pnpm"]):
             Colors.error("pnpm 安装失败")
             return False
         Colors.success("pnpm 安装成功")
     else:
-        result = run_command("pnpm --version", capture_output=True)
-        Colors.success(f"pnpm 已安装 (版本: {result.stdout.strip()})")
+        Colors.success(f"pnpm 已安装 (版本: {get_command_version('pnpm')})")
 
     return True
 
@@ -95,23 +172,22 @@ def install_python_deps(backend_path):
     # 创建虚拟环境
     if not venv_path.exists():
         Colors.info("创建 Python 虚拟环境...")
-        if not run_command(f"python -m venv venv", cwd=backend_path):
+        if not run_command_buffered(["python", "-m", "venv", "venv"], cwd=backend_path):
             Colors.error("虚拟环境创建失败")
             return False
         Colors.success("虚拟环境创建成功")
     else:
         Colors.warning("虚拟环境已存在，跳过创建")
 
-    # 激活虚拟环境并安装依赖
+    # 激活虚拟环境并安装依赖（不经过 shell 时需使用绝对路径）
     if platform.system() == "Windows":
-        pip_cmd = "venv\\Scripts\\pip.exe"
-        requirements_file = "requirements.txt"
+        pip_cmd = str(venv_path / "Scripts" / "pip.exe")
     else:
-        pip_cmd = "venv/bin/pip"
-        requirements_file = "requirements.txt"
+        pip_cmd = str(venv_path / "bin" / "pip")
+    requirements_file = "requirements.txt"
 
     Colors.info("安装 Python 依赖包...")
-    if not run_command(f"{pip_cmd} install -r {requirements_file}", cwd=backend_path):
+    if not run_command_buffered([pip_cmd, "install", "-r", requirements_file], cwd=backend_path):
         Colors.error("Python 依赖安装失败")
         return False
 
@@ -124,7 +200,7 @@ def install_node_deps(frontend_path):
     Colors.step("5. 安装前端 Node.js 依赖...")
 
     Colors.info("安装前端依赖包...")
-    if not run_command("pnpm install", cwd=frontend_path):
+    if not run_command_buffered(["pnpm", "install"], cwd=frontend_path):
         Colors.error("前端依赖安装失败")
         return False
 
@@ -157,25 +233,32 @@ def main():
         Colors.error("未找到 Python，请先安装 Python 3.8+")
         return 1
 
-    result = run_command("python --version", capture_output=True) or run_command("python3 --version", capture_output=True)
-    Colors.success(f"Python: {result.stdout.strip()}")
+    python_cmd = 'python' if check_command_exists('python') else 'python3'
+    Colors.success(f"Python: {get_command_version(python_cmd)}")
 
     Colors.step("2. 检查 Node.js 环境...")
     if not check_command_exists('node'):
         Colors.error("未找到 Node.js，请先安装 Node.js")
         return 1
 
-    result = run_command("node --version", capture_output=True)
-    Colors.success(f"Node.js: {result.stdout.strip()}")
+    Colors.success(f"Node.js: {get_command_version('node')}")
 
     # 安装依赖
     if not install_package_manager():
         return 1
 
-    if not install_python_deps(backend_path):
-        return 1
-
-    if not install_node_deps(frontend_path):
+    # 前后端依赖互不相关，并行安装；各任务输出分别缓存，完成后整块打印
+    stdout = sys.stdout
+    sys.stdout = _JobStdout(stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            python_future = executor.submit(run_buffered_job, install_python_deps, backend_path)
+            node_future = executor.submit(run_buffered_job, install_node_deps, frontend_path)
+            results = [python_future.result(), node_future.result()]
+    finally:
+        sys.stdout = stdout
+
+    if not all(results):
         return 1
 
     print()
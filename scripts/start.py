@@ -6,11 +6,17 @@ EM-Automate 项目启动脚本
 
 import os
 import sys
+import locale
+import codecs
+import selectors
+import shutil
 import subprocess
 import signal
+import socket
 import time
 import platform
 import threading
+from collections import deque
 from pathlib import Path
 
 
@@ -44,31 +50,194 @@ class Colors:
         print(f"{Colors.BOLD}{msg}{Colors.END}")
 
 
+class ColorsB:
+    """终端颜色（字节形式），用于直接写入 sys.stdout.buffer 的输出"""
+    GREEN = b'\033[92m'
+    RED = b'\033[91m'
+    YELLOW = b'\033[93m'
+    BLUE = b'\033[94m'
+    BOLD = b'\033[1m'
+    END = b'\033[0m'
+
+
+# 平台相关常量（导入时确定一次）
+IS_WINDOWS = platform.system() == "Windows"
+# Windows 下使用 pnpm.cmd
+PNPM = "pnpm.cmd" if IS_WINDOWS else "pnpm"
+# 虚拟环境内 Python 可执行文件的相对路径
+PY_VENV_REL = Path("Scripts", "python.exe") if IS_WINDOWS else Path("bin", "python")
+
+# 每个服务在独立的进程组中启动，停止时可一并结束其子进程（uvicorn reload、vite 等）
+PROCESS_GROUP_KWARGS = (
+    {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP} if IS_WINDOWS
+    else {'start_new_session': True}
+)
+
+# 停止服务时等待进程退出的最长时间（秒），所有服务共用
+SHUTDOWN_TIMEOUT = 5
+
+# 子进程输出每次读取的块大小
+READ_CHUNK_SIZE = 65536
+
+# 等待服务端口可连接的最长时间（秒）
+SERVICE_READY_TIMEOUT = 30
+
+# 子进程输出管道的缓冲区大小（仅 Linux 可调整），日志突发时子进程不必阻塞等待读取
+PIPE_BUFFER_SIZE = 1 << 20
+if sys.platform.startswith('linux'):
+    import fcntl
+    F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+else:
+    F_SETPIPE_SZ = None
+
+# Windows 的 select 不支持管道，只能每个流一个读取线程
+MULTIPLEX_AVAILABLE = not IS_WINDOWS
+
+
+def write_stdout_bytes(parts):
+    """直接向终端写入一批字节并刷新；先刷新文本层缓冲，保证与 print 输出的先后顺序一致"""
+    sys.stdout.flush()
+    sys.stdout.buffer.writelines(parts)
+    sys.stdout.buffer.flush()
+
+
 class OutputReader:
     """输出读取器，用于实时显示子进程输出"""
 
-    def __init__(self, process, name, color_prefix):
+    def __init__(self, process, name, color_prefix, sink=None):
         self.process = process
         self.name = name
         self.color_prefix = color_prefix
+        # 输出去向，为 None 时直接写入终端
+        self.sink = sink
         self.running = True
+        # 子进程按系统默认编码输出，与原先文本模式管道的解码方式一致
+        self.encoding = locale.getpreferredencoding(False)
+        # 编码与终端一致时直接写入原始字节，否则逐行转码
+        self.out_encoding = sys.stdout.encoding or 'utf-8'
+        self.passthrough = codecs.lookup(self.encoding).name == codecs.lookup(self.out_encoding).name
+        self.prefix = b''.join((color_prefix, f"[{name}]".encode(self.out_encoding), ColorsB.END, b' '))
+        self.format_line = self._make_formatter()
+
+    def _make_formatter(self):
+        """生成本数据流专用的行格式化函数，前缀和编码在创建时绑定"""
+        prefix = self.prefix
+        newline = b'\n'
+
+        if self.passthrough:
+            def format_line(line):
+                """为一行子进程日志加上前缀，返回待写入的字节片段"""
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                return (prefix, line, newline)
+        else:
+            encoding = self.encoding
+            out_encoding = self.out_encoding
+
+            def format_line(line):
+                """为一行子进程日志加上前缀并转码，返回待写入的字节片段"""
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                return (prefix, line.decode(encoding, 'replace').encode(out_encoding, 'replace'), newline)
+
+        return format_line
+
+    def write(self, parts):
+        """一次性写入并刷新一批输出"""
+        if self.sink is not None:
+            self.sink(parts)
+            return
+        write_stdout_bytes(parts)
+
+    def feed(self, buf, chunk):
+        """追加读取到的数据块，批量输出其中所有完整的行"""
+        buf += chunk
+        out = []
+        nl = buf.find(b'\n')
+        while nl >= 0:
+            out.extend(self.format_line(bytes(buf[:nl])))
+            del buf[:nl + 1]
+            nl = buf.find(b'\n')
+        if out:
+            self.write(out)
+
+    def finish(self, buf):
+        """输出结束时剩余的不完整行"""
+        if buf:
+            self.write(self.format_line(bytes(buf)))
+            buf.clear()
 
     def read_output(self, stream):
-        """读取并输出流"""
+        """按块读取流并拆分为行输出"""
+        fd = stream.fileno()
+        buf = bytearray()
         while self.running:
             try:
-                line = stream.readline()
-                if line:
-                    print(f"{self.color_prefix}[{self.name}]{Colors.END} {line.strip()}")
-                else:
-                    break
-            except:
+                chunk = os.read(fd, READ_CHUNK_SIZE)
+            except OSError:
                 break
+            if not chunk:
+                break
+            self.feed(buf, chunk)
+
+        self.finish(buf)
 
-    def start_reading(self, stdout, stderr):
-        """开始读取输出"""
+    def start_reading(self, stdout):
+        """开始读取输出（stderr 已合并到 stdout）"""
         threading.Thread(target=self.read_output, args=(stdout,), daemon=True).start()
-        threading.Thread(target=self.read_output, args=(stderr,), daemon=True).start()
+
+
+class OutputMultiplexer:
+    """输出多路复用器，由主线程通过 selectors 非阻塞地读取所有子进程管道（仅 POSIX）"""
+
+    def __init__(self):
+        self.selector = selectors.DefaultSelector()
+
+    def register(self, stream, reader):
+        """注册一个输出流"""
+        fd = stream.fileno()
+        os.set_blocking(fd, False)
+        self.selector.register(fd, selectors.EVENT_READ, (reader, bytearray()))
+
+    def poll(self, timeout):
+        """
+        等待并处理可读的输出，最多阻塞 timeout 秒
+
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        if not self.selector.get_map():
+            time.sleep(timeout)
+            return
+
+        for key, _ in self.selector.select(timeout):
+            reader, buf = key.data
+            try:
+                chunk = os.read(key.fd, READ_CHUNK_SIZE)
+            except BlockingIOError:
+                continue
+            except OSError:
+                chunk = b''
+
+            if chunk:
+                reader.feed(buf, chunk)
+            else:
+                reader.finish(buf)
+                self.selector.unregister(key.fd)
+
+    def close(self):
+        """关闭选择器"""
+        self.selector.close()
+
+
+def dir_has_entries(path):
+    """检查目录存在且非空（一次 scandir 完成）"""
+    try:
+        with os.scandir(path) as entries:
+            next(entries)
+        return True
+    except (FileNotFoundError, NotADirectoryError, StopIteration):
+        return False
 
 
 class ProjectStarter:
@@ -79,36 +248,73 @@ class ProjectStarter:
         self.script_dir = Path(__file__).parent
         self.backend_path = self.script_dir.parent / "backend"
         self.frontend_path = self.script_dir.parent / "frontend"
+        self.output = OutputMultiplexer() if MULTIPLEX_AVAILABLE else None
+        self._cleaned_up = False
+
+        # Windows 下读取线程只负责读取，输出交给主线程统一写入终端
+        self._pending_output = deque()
+        self._output_ready = threading.Event()
+        self.output_sink = None if MULTIPLEX_AVAILABLE else self.queue_output
+
+    def queue_output(self, parts):
+        """读取线程提交待输出的内容（deque 的 append 是线程安全的）"""
+        self._pending_output.append(parts)
+        self._output_ready.set()
+
+    def flush_pending_output(self):
+        """将读取线程提交的内容一次性写入终端"""
+        parts = []
+        while self._pending_output:
+            parts.extend(self._pending_output.popleft())
+        if parts:
+            write_stdout_bytes(parts)
+
+    def watch_output(self, process, reader):
+        """开始显示子进程输出"""
+        if F_SETPIPE_SZ is not None:
+            try:
+                fcntl.fcntl(process.stdout.fileno(), F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+            except OSError:
+                # 超过系统上限（/proc/sys/fs/pipe-max-size）时保持默认大小
+                pass
+
+        if self.output is not None:
+            self.output.register(process.stdout, reader)
+        else:
+            reader.start_reading(process.stdout)
+
+    def drain_output(self, timeout):
+        """在主线程处理子进程输出，最多等待 timeout 秒"""
+        if self.output is not None:
+            self.output.poll(timeout)
+        else:
+            self._output_ready.wait(timeout)
+            self._output_ready.clear()
+            self.flush_pending_output()
 
     def check_command_exists(self, command):
-        """检查命令是否存在"""
-        try:
-            subprocess.run([command, '--version'],
-                          capture_output=True, check=True, timeout=5)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """检查命令是否存在（只在 PATH 中查找，不启动进程；Windows 下按 PATHEXT 匹配扩展名）"""
+        return shutil.which(command) is not None
 
     def check_environment(self):
         """检查环境是否就绪"""
         Colors.step("1. 检查环境...")
 
         # 检查 pnpm 是否安装（Windows 下使用 pnpm.cmd）
-        pnpm_cmd = 'pnpm.cmd' if platform.system() == "Windows" else 'pnpm'
-        if not self.check_command_exists(pnpm_cmd):
+        if not self.check_command_exists(PNPM):
             Colors.error("pnpm 未安装或不在 PATH 中")
             Colors.info("请先运行 python install_deps.py 安装依赖，或手动安装 pnpm")
             return False
 
         # 检查后端虚拟环境
         venv_path = self.backend_path / "venv"
-        if not venv_path.exists():
+        if not dir_has_entries(venv_path):
             Colors.error("后端虚拟环境不存在，请先运行 python install_deps.py")
             return False
 
         # 检查前端依赖
         node_modules = self.frontend_path / "node_modules"
-        if not node_modules.exists():
+        if not dir_has_entries(node_modules):
             Colors.error("前端依赖不存在，请先运行 python install_deps.py")
             return False
 
@@ -120,13 +326,10 @@ class ProjectStarter:
         Colors.step("2. 启动后端服务...")
 
         # 确定虚拟环境的 Python 路径
-        if platform.system() == "Windows":
-            python_path = self.backend_path / "venv" / "Scripts" / "python.exe"
-        else:
-            python_path = self.backend_path / "venv" / "bin" / "python"
+        python_path = self.backend_path / "venv" / PY_VENV_REL
 
         # 检查 Python 可执行文件是否存在
-        if not python_path.exists():
+        if not python_path.is_file():
             Colors.error(f"Python 虚拟环境未找到: {python_path}")
             Colors.info("请先运行 python install.py 安装依赖")
             return False
@@ -141,15 +344,14 @@ class ProjectStarter:
                 backend_cmd,
                 cwd=self.backend_path,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                **PROCESS_GROUP_KWARGS
             )
 
             # 创建输出读取器
-            reader = OutputReader(process, "后端", Colors.BLUE)
-            reader.start_reading(process.stdout, process.stderr)
+            reader = OutputReader(process, "后端", ColorsB.BLUE, self.output_sink)
+            self.watch_output(process, reader)
 
             self.processes.append(('backend', process, reader))
             Colors.success("后端服务启动成功")
@@ -164,11 +366,7 @@ class ProjectStarter:
         """启动前端服务"""
         Colors.step("3. 启动前端服务...")
 
-        # 根据平台选择正确的命令
-        if platform.system() == "Windows":
-            frontend_cmd = ["pnpm.cmd", "run", "dev"]
-        else:
-            frontend_cmd = ["pnpm", "run", "dev"]
+        frontend_cmd = [PNPM, "run", "dev"]
 
         Colors.info("启动 Vue3 开发服务器 (端口 5173)...")
 
@@ -177,15 +375,14 @@ class ProjectStarter:
                 frontend_cmd,
                 cwd=self.frontend_path,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                **PROCESS_GROUP_KWARGS
             )
 
             # 创建输出读取器
-            reader = OutputReader(process, "前端", Colors.GREEN)
-            reader.start_reading(process.stdout, process.stderr)
+            reader = OutputReader(process, "前端", ColorsB.GREEN, self.output_sink)
+            self.watch_output(process, reader)
 
             self.processes.append(('frontend', process, reader))
             Colors.success("前端服务启动成功")
@@ -195,17 +392,49 @@ class ProjectStarter:
             Colors.error(f"前端服务启动失败: {e}")
             return False
 
+    def wait_for_port(self, port, process, timeout=SERVICE_READY_TIMEOUT):
+        """
+        等待端口可连接
+
+        Args:
+            port: 服务端口
+            process: 服务进程，进程退出时停止等待
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            端口是否已可连接
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                return False
+            try:
+                # 使用 localhost 同时尝试 IPv4 和 IPv6（Vite 可能只监听 ::1）
+                with socket.create_connection(("localhost", port), timeout=0.25):
+                    return True
+            except OSError:
+                self.drain_output(0.05)
+        return False
+
     def wait_for_services(self):
         """等待服务启动"""
         Colors.step("4. 等待服务就绪...")
 
+        processes = {name: process for name, process, reader in self.processes}
+        ready = True
+
         Colors.info("等待后端服务启动...")
-        time.sleep(3)
+        if not self.wait_for_port(8000, processes['backend']):
+            Colors.warning("后端服务未在预期时间内就绪")
+            ready = False
 
         Colors.info("等待前端服务启动...")
-        time.sleep(5)
+        if not self.wait_for_port(5173, processes['frontend']):
+            Colors.warning("前端服务未在预期时间内就绪")
+            ready = False
 
-        Colors.success("所有服务已就绪")
+        if ready:
+            Colors.success("所有服务已就绪")
 
     def show_service_info(self):
         """显示服务信息"""
@@ -222,32 +451,102 @@ class ProjectStarter:
         print("实时日志输出将显示在下方，按 Ctrl+C 停止所有服务")
         print("-" * 50)
 
+    def terminate_group(self, process):
+        """请求服务进程组退出（组长已退出时组内子进程可能仍在运行，同样需要处理）"""
+        if IS_WINDOWS:
+            if process.poll() is None:
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                # 组长已退出，CTRL_BREAK 无法送达，直接结束残留的进程树
+                self.taskkill_tree(process)
+        else:
+            # start_new_session 创建的进程组 ID 即为进程 ID
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass  # 组内已无进程
+
+    def kill_group(self, process):
+        """强制结束服务进程及其所有子进程"""
+        if IS_WINDOWS:
+            self.taskkill_tree(process)
+        else:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        process.wait()
+
+    def taskkill_tree(self, process):
+        """Windows 下强制结束进程及其子进程树"""
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def group_alive(self, process):
+        """POSIX 下判断服务进程组内是否仍有进程"""
+        try:
+            os.killpg(process.pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+
+    def wait_group(self, process, timeout):
+        """等待服务进程组退出，超时抛出 subprocess.TimeoutExpired"""
+        deadline = time.monotonic() + timeout
+        process.wait(timeout=timeout)
+        if IS_WINDOWS:
+            return
+        # 组长退出后组内可能仍有子进程（如 vite、uvicorn 工作进程）
+        while self.group_alive(process):
+            if time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            time.sleep(0.05)
+
     def cleanup(self):
-        """清理资源"""
+        """清理资源（只执行一次）"""
+        if self._cleaned_up:
+            return
+        self._cleaned_up = True
+
         Colors.info("正在停止所有服务...")
+        if self.output is not None:
+            # 输出进程退出前最后写出的日志
+            self.output.poll(0)
+            self.output.close()
+        else:
+            self.flush_pending_output()
+
+        # 先向所有服务的进程组发送终止信号，再在共同的期限内等待
+        # （组长已退出的服务也要处理，其子进程仍可能在运行）
+        stopping = []
         for name, process, reader in self.processes:
+            # 停止输出读取器
+            reader.running = False
+
             try:
-                # 停止输出读取器
-                if hasattr(reader, 'running'):
-                    reader.running = False
-
-                if process.poll() is None:  # 进程仍在运行
-                    process.terminate()
-                    # 等待进程结束，最多等待5秒
-                    process.wait(timeout=5)
-                    Colors.success(f"{name} 服务已停止")
-            except subprocess.TimeoutExpired:
-                Colors.warning(f"强制终止 {name} 服务")
-                process.kill()
+                self.terminate_group(process)
+                stopping.append((name, process))
             except Exception as e:
                 Colors.error(f"停止 {name} 服务时出错: {e}")
 
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        for name, process in stopping:
+            try:
+                self.wait_group(process, max(0, deadline - time.monotonic()))
+                Colors.success(f"{name} 服务已停止")
+            except subprocess.TimeoutExpired:
+                Colors.warning(f"强制终止 {name} 服务")
+                try:
+                    self.kill_group(process)
+                except Exception as e:
+                    Colors.error(f"停止 {name} 服务时出错: {e}")
+
     def signal_handler(self, signum, frame):
-        """信号处理器"""
-        print()
-        Colors.info("接收到中断信号，正在关闭服务...")
-        self.cleanup()
-        sys.exit(0)
+        """信号处理器，转为 KeyboardInterrupt 由主循环统一清理"""
+        # 清理开始后忽略重复的中断，避免打断停止流程而遗留进程组
+        if self._cleaned_up:
+            return
+        raise KeyboardInterrupt
 
     def run(self):
         """运行启动器"""
@@ -259,40 +558,49 @@ class ProjectStarter:
         if not self.check_environment():
             return 1
 
-        # 启动服务
-        if not self.start_backend():
-            return 1
-
-        if not self.start_frontend():
-            self.cleanup()
-            return 1
-
-        # 等待服务就绪
-        self.wait_for_services()
-
-        # 显示服务信息
-        self.show_service_info()
-
-        # 注册信号处理器
+        # 注册信号处理器（在启动第一个服务之前，启动和等待就绪期间的中断同样能停止已启动的服务）
         try:
             signal.signal(signal.SIGINT, self.signal_handler)
-            if platform.system() != "Windows":
+            if not IS_WINDOWS:
                 signal.signal(signal.SIGTERM, self.signal_handler)
         except (AttributeError, OSError):
             # Windows 下可能不支持某些信号
             pass
 
-        # 保持脚本运行
+        # 从启动第一个服务起，任何退出路径都会清理已启动的服务
+        exit_code = 0
         try:
+            # 启动服务
+            if not self.start_backend():
+                return 1
+
+            if not self.start_frontend():
+                return 1
+
+            # 等待服务就绪
+            self.wait_for_services()
+
+            # 显示服务信息
+            self.show_service_info()
+
+            # 保持脚本运行
+            # 任一服务退出即停止其余服务，期间处理子进程输出
+            # （孙进程可能继承并持有输出管道，子进程退出时不一定产生 EOF，
+            #   因此 select 最多等待 0.2 秒，每轮都显式检查 poll()）
+            while all(process.poll() is None for name, process, reader in self.processes):
+                self.drain_output(0.2)
+
             for name, process, reader in self.processes:
-                process.wait()
+                if process.returncode is not None:
+                    Colors.warning(f"{name} 服务已退出 (退出码: {process.returncode})，正在停止其他服务...")
+            exit_code = 1
         except KeyboardInterrupt:
             print()
             Colors.info("接收到中断信号，正在关闭服务...")
         finally:
             self.cleanup()
 
-        return 0
+        return exit_code
 
 
 def main():